@@ -1,7 +1,37 @@
+import time
+_run_started = time.perf_counter()
+
+from collections import deque
 import streamlit as st
 from auth import check_password
 from theme import apply_scifi_theme, show_copyright
-from automation import run_automation
+from jobs import JobStore, start_job, render_job, get_job_status, FINISHED_STATUSES
+from batch_jobs import parse_batch_jobs
+from timing import percentile
+# Selenium and the automation modules are only imported by job worker processes,
+# never by the app server
+
+# Script run times kept per page for the p50/p95 caption
+RENDER_SAMPLES = 500
+
+@st.cache_resource
+def render_timings():
+    """Process-wide recent script run times of the app, per page"""
+    return {}
+
+@st.cache_resource
+def job_store():
+    """Job store connection shared by all sessions of this server process"""
+    return JobStore()
+
+def show_render_time(page):
+    """Record this script run and show it with the process-wide p50/p95"""
+    elapsed = time.perf_counter() - _run_started
+    samples = render_timings().setdefault(page, deque(maxlen=RENDER_SAMPLES))
+    samples.append(elapsed)
+    recent = sorted(samples)
+    p50, p95 = percentile(recent, 50), percentile(recent, 95)
+    st.caption(f"⏱️ {page}: {elapsed * 1000:.0f} ms (p50 {p50 * 1000:.0f} ms · p95 {p95 * 1000:.0f} ms over the last {len(recent)} runs)")
 
 # Apply theme
 apply_scifi_theme()
@@ -21,53 +51,104 @@ if check_password():
     # Input fields in a container
     st.subheader("⚙️ SYSTEM CONFIGURATION")
     
+    mode = st.radio("🗂️ MODE", ["SINGLE TENDER", "BATCH"], horizontal=True)
+    batch_mode = mode == "BATCH"
+    
     col1, col2 = st.columns(2)
     
     with col1:
         email = st.text_input("📧 EMAIL ADDRESS")
-        tender_id = st.text_input("🆔 TENDER ID")
+        tender_id = "batch" if batch_mode else st.text_input("🆔 TENDER ID").strip()
     
     with col2:
         password = st.text_input("🔑 PASSWORD", type="password")
         remark_text = st.text_input("💬 EVALUATION REMARK", value="Accept")
 
-    # Skip option
-    start_from = st.number_input("⏭️ SKIP FIRST N TENDERERS (Optional)", min_value=0, value=0, step=1)
+    # Batch input: one "tender_id, remark" per line, or an uploaded CSV/TXT in the same format
+    batch_text = ""
+    if batch_mode:
+        batch_text = st.text_area("🆔 TENDER IDS (one per line: tender_id, remark - remark is optional)")
+        batch_file = st.file_uploader("📄 OR UPLOAD TENDER LIST", type=["csv", "txt"])
+        if batch_file is not None:
+            batch_text += "\n" + batch_file.getvalue().decode("utf-8-sig")
+
+    # Skip and concurrency options
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        start_from = st.number_input("⏭️ SKIP FIRST N TENDERERS (Optional)", min_value=0, value=0, step=1, disabled=batch_mode)
+    
+    with col2:
+        workers = st.number_input("🧵 MAX PARALLEL WORKERS (fewer run while memory or CPU is tight)", min_value=1, max_value=8, value=1, step=1)
+
+    resume = st.checkbox("♻️ RESUME FROM CHECKPOINT (skip tenderers completed in earlier runs)", value=True)
+    fast_path = st.checkbox("⚡ HTTP FAST PATH FOR FORM SUBMISSION (Experimental)", value=False)
+    preflight = st.checkbox("🛰️ PRE-FLIGHT SCAN (skip tenderers with nothing pending, largest first)", value=True)
+    multi_tab = st.checkbox("🗂️ RUN PARALLEL WORKERS AS TABS OF ONE BROWSER (less memory)", value=False)
 
     # Center the button
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
         run_button = st.button("▶ EXECUTE AUTOMATION")
 
+    # Jobs run in background worker processes; their IDs live in the URL so a refresh keeps them
+    job_ids = [job_id for job_id in st.query_params.get("jobs", "").split(",") if job_id]
+
     if run_button:
-        if not email or not password or not tender_id:
+        batch_jobs = parse_batch_jobs(batch_text, remark_text) if batch_mode else []
+        if not email or not password or not tender_id or (batch_mode and not batch_jobs):
             st.warning("⚠️ ALL FIELDS REQUIRED FOR SYSTEM INITIALIZATION")
         else:
-            st.info("🔄 INITIALIZING AUTOMATION SEQUENCE...")
-            run_automation(email, password, tender_id, remark_text, start_from)
-    
-    # Show download button if CSV data exists from previous run
-    if 'csv_data' in st.session_state and len(st.session_state.csv_data) > 1:
+            options = dict(email=email, password=password, workers=workers, resume=resume, fast_path=fast_path, preflight=preflight, multi_tab=multi_tab)
+            if batch_mode:
+                job_id = start_job("batch", f"BATCH OF {len(batch_jobs)} TENDERS", dict(options, jobs=batch_jobs))
+            else:
+                job_id = start_job("single", f"TENDER {tender_id}", dict(
+                    options, tender_id=tender_id, remark_text=remark_text, start_from=start_from,
+                ))
+            job_ids.append(job_id)
+            st.query_params["jobs"] = ",".join(job_ids)
+            st.success(f"🛰️ JOB {job_id} STARTED IN BACKGROUND")
+
+    with st.expander("🔗 ATTACH TO A RUNNING JOB"):
+        attach_id = st.text_input("JOB ID")
+        if st.button("ATTACH") and attach_id.strip() and attach_id.strip() not in job_ids:
+            job_ids.append(attach_id.strip())
+            st.query_params["jobs"] = ",".join(job_ids)
+
+    if job_ids:
         st.divider()
-        st.subheader("📥 PREVIOUS RUN DATA")
-        
-        import csv
-        import io
-        from datetime import datetime
-        
-        csv_buffer = io.StringIO()
-        writer = csv.writer(csv_buffer)
-        writer.writerows(st.session_state.csv_data)
-        
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col2:
-            st.download_button(
-                label=f"📥 Download Previous Log ({len(st.session_state.csv_data)-1} entries)",
-                data=csv_buffer.getvalue(),
-                file_name=f"log_{tender_id}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                mime="text/csv"
-            )
+        st.subheader("🛰️ BACKGROUND JOBS")
+
+        store = job_store()
+        running = []
+        for job_id in reversed(job_ids):
+            job = get_job_status(job_id, store)
+            if job is not None and job["status"] not in FINISHED_STATUSES:
+                running.append(job_id)
+
+        if running:
+            @st.fragment(run_every=2)
+            def job_monitor():
+                """Poll unfinished jobs; once one finishes, a full rerun moves it below"""
+                finished = False
+                for job_id in running:
+                    with st.container(border=True):
+                        job = render_job(job_id, store)
+                    finished = finished or job is None or job["status"] in FINISHED_STATUSES
+                if finished:
+                    st.rerun()
+
+            job_monitor()
+
+        # Finished jobs (with their downloads) render once per script run, outside the polling
+        for job_id in reversed(job_ids):
+            if job_id not in running:
+                with st.container(border=True):
+                    render_job(job_id, store)
     
+    show_render_time("app rerun")
     show_copyright()
 else:
+    show_render_time("gate page")
     show_copyright()
\ No newline at end of file
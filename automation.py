@@ -1,497 +1,768 @@
-import streamlit as st
-from selenium import webdriver
+from reporting import st
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
 import os
-import csv
 from datetime import datetime
-import io
-
-# --- Chrome Driver Setup ---
-def get_chrome_driver():
-    """Initialize Chrome driver compatible with both local and Streamlit Cloud"""
-    chrome_options = Options()
-    
-    # Essential options for Streamlit Cloud
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-features=NetworkService")
-    chrome_options.add_argument("--window-size=1920x1080")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--disable-infobars")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    # Check if running on Streamlit Cloud (Linux with chromium installed)
-    if os.path.exists("/usr/bin/chromium"):
-        st.info("🌐 Detected Streamlit Cloud environment")
-        chrome_options.binary_location = "/usr/bin/chromium"
-        service = Service("/usr/bin/chromedriver")
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-    else:
-        # Local development - use webdriver-manager
-        st.info("💻 Detected local environment")
-        from webdriver_manager.chrome import ChromeDriverManager
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    return driver
+from urllib.parse import urlsplit
+import queue
+import itertools
+import time
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from waits import (
+    click_and_wait_for_page, wait_for_navigation, load_page,
+    wait_for_tenderers_table, wait_for_forms_table,
+)
+from driver_pool import get_driver_pool
+from timing import StepTimings, render_latency_report
+from resource_policy import page_loads, render_resource_report
+from run_log import RunLog, CsvLog
+from checkpoint import CheckpointStore, FreshRunCheckpoint
+from extract import extract_tenderers_table, extract_form_rows, classify_form_rows, cell_text, cell_link
+from cookie_cache import load_cookies, save_cookies, clear_cookies, snapshot_cookies, restore_cookies
+from http_engine import session_from_driver, fetch_form_rows, submit_evaluation
+from planner import scan_tenderers, order_work_plan, estimate_runtime, render_work_plan
+from rate_limit import portal_limiter
+from dialogs import drain_dialogs
+from concurrency import ConcurrencyController, browser_over_ceiling
+from retry import TransientError, backoff_delay, portal_throttle, RETRY_ROUNDS
+from outcomes import FormQueue, tenderer_started, tenderer_succeeded, tenderer_failed, tenderer_unreached
+
+# Action-column text of one form row, looked up by its fformtr_ ID
+ROW_ACTION_TEXT_JS = """
+var row = document.getElementById(arguments[0]);
+return row && row.cells.length > 2 ? row.cells[2].innerText.trim() : null;
+"""
+
+# Fill the evaluation form (Qualified + remark, with the events a user's input would fire)
+# and post it in one round trip. The fields are read back first; the post button is
+# clicked just after the script returns, so the navigation cannot cut the result off.
+FILL_AND_SUBMIT_JS = """
+var radio = document.getElementById('techQualify');
+var remarks = document.getElementById('evalNonCompRemarks');
+var button = document.getElementById('btnPost');
+if (!radio || !remarks || !button) return {error: 'missing'};
+if (!radio.checked) radio.click();
+remarks.value = arguments[0];
+['input', 'change'].forEach(function (type) {
+    remarks.dispatchEvent(new Event(type, {bubbles: true}));
+});
+if (!radio.checked || remarks.value !== arguments[0]) return {error: 'unchanged'};
+button.scrollIntoView(true);
+setTimeout(function () { button.click(); }, 0);
+return {button: button};
+"""
+
+CSV_HEADER = ['Timestamp', 'Tender_ID', 'Tenderer_Num', 'Tenderer_Name', 'Status', 'Forms_Count', 'Error']
+
+# Portal root; point at stub_server.py to replay recorded pages locally
+BASE_URL = os.getenv("EPROCURE_BASE_URL", "https://www.eprocure.gov.bd")
+
+# Officer-only page used to check whether a restored session is still logged in
+SESSION_CHECK_PATH = "/officer/MyTenders.jsp"
+
+# Open the Clarification tab by URL instead of the six-page menu walk (set to 0 to always walk the menu)
+DIRECT_NAVIGATION = os.getenv("EPROCURE_DIRECT_NAV", "1") != "0"
+
+# Fill and post each form with a single script call instead of typing into it (set to 0 to type)
+SCRIPTED_FORM_FILL = os.getenv("EPROCURE_SCRIPTED_FILL", "1") != "0"
+
+def open_clarification_directly(driver, tender_id, timings):
+    """Load the Evaluation Committee page by URL and open its Clarification tab"""
+    wait = WebDriverWait(driver, 15)
+    with timings.step("nav: evaluation committee (direct)"):
+        load_page(driver, f"{BASE_URL}/officer/EvalComm.jsp?tenderid={tender_id}")
+
+    # Raises if the portal redirected elsewhere (no access, unknown tender, expired session)
+    with timings.step("nav: clarification tab"):
+        clarification_tab = wait.until(EC.element_to_be_clickable((By.ID, "tbClari")))
+        with portal_limiter.paced(driver):
+            clarification_tab.click()
+            wait_for_tenderers_table(driver)
+
+def navigate_to_clarification(driver, tender_id, timings=None, direct=DIRECT_NAVIGATION):
+    """Navigate to the tender's Clarification tab: by direct URL, falling back to the menu walk"""
+    timings = timings or StepTimings()
+    if direct:
+        try:
+            with timings.step("route: direct url"):
+                open_clarification_directly(driver, tender_id, timings)
+            return True
+        except Exception as e:
+            st.warning(f"⚠️ DIRECT NAVIGATION FAILED ({type(e).__name__}) - FALLING BACK TO MENU WALK")
+            # The menu walk starts from the header menu, which error pages lack
+            if not driver.find_elements(By.ID, "headTabTender"):
+                load_page(driver, BASE_URL + SESSION_CHECK_PATH)
 
-def navigate_to_clarification(driver, tender_id):
-    """Navigate from current page to Clarification tab"""
     try:
-        # Wait for page to be fully loaded
-        wait = WebDriverWait(driver, 15)
-        
-        # Navigate to My Tenders - with explicit wait
+        with timings.step("route: menu walk"):
+            walk_menu_to_clarification(driver, tender_id, timings)
+        return True
+    except Exception as e:
+        st.error(f"❌ NAVIGATION ERROR: {str(e)}")
+        return False
+
+def walk_menu_to_clarification(driver, tender_id, timings):
+    """Reach the Clarification tab through My Tenders, the dashboard and the Evaluation Committee page"""
+    # Wait for page to be fully loaded
+    wait = WebDriverWait(driver, 15)
+    
+    # Navigate to My Tenders - the hover menu is ready once the link is clickable
+    with timings.step("nav: my tenders"):
         wait.until(EC.presence_of_element_located((By.ID, "headTabTender")))
         actions = ActionChains(driver)
         tender_tab = wait.until(EC.element_to_be_clickable((By.ID, "headTabTender")))
         actions.move_to_element(tender_tab).perform()
-        time.sleep(2)
         
         my_tender_link = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[@href='/officer/MyTenders.jsp']")))
-        my_tender_link.click()
-        time.sleep(5)
+        click_and_wait_for_page(driver, my_tender_link)
 
-        # Enter tender ID
+    # Enter tender ID and click Processing Tab
+    with timings.step("nav: processing tab"):
         tender_input = wait.until(EC.presence_of_element_located((By.ID, "tenderId")))
         tender_input.clear()
         tender_input.send_keys(tender_id)
-        time.sleep(1)
 
-        # Click Processing Tab
         processing_tab = wait.until(EC.element_to_be_clickable((By.ID, "processingTab")))
+        portal_limiter.acquire(driver)
         processing_tab.click()
-        time.sleep(3)
 
-        # Open Dashboard
+    # Open Dashboard (the link only appears once the processing grid has loaded)
+    with timings.step("nav: dashboard"):
         dashboard_xpath = f"//a[@href='/officer/TenderDashboard.jsp?tenderid={tender_id}']"
         dashboard_link = wait.until(EC.element_to_be_clickable((By.XPATH, dashboard_xpath)))
-        dashboard_link.click()
-        time.sleep(3)
+        click_and_wait_for_page(driver, dashboard_link)
 
-        # Open Evaluation Committee
+    # Open Evaluation Committee
+    with timings.step("nav: evaluation committee"):
         eval_comm_xpath = f"//a[contains(@href,'/officer/EvalComm.jsp?tenderid={tender_id}')]"
         eval_comm_link = wait.until(EC.element_to_be_clickable((By.XPATH, eval_comm_xpath)))
-        eval_comm_link.click()
-        time.sleep(3)
+        click_and_wait_for_page(driver, eval_comm_link)
 
-        # Click Clarification Tab
+    # Click Clarification Tab and wait for the tenderers table to render
+    with timings.step("nav: clarification tab"):
         clarification_tab = wait.until(EC.element_to_be_clickable((By.ID, "tbClari")))
-        clarification_tab.click()
-        time.sleep(3)
-        
-        return True
-    except Exception as e:
-        st.error(f"❌ NAVIGATION ERROR: {str(e)}")
-        return False
+        with portal_limiter.paced(driver):
+            clarification_tab.click()
+            wait_for_tenderers_table(driver)
 
-def process_tenderer_forms(driver, wait, remark_text, tenderer_name, status_text, current_num=None, total_num=None):
-    """Process all forms for a specific tenderer that have 'Evaluate Form' action"""
-    forms_processed = 0
-    forms_skipped = 0
+def process_tenderer_forms(driver, wait, remark_text, tenderer_name, run_log, current_num=None, total_num=None, timings=None, checkpoint=None, tender_id=None):
+    """Process all forms for a specific tenderer that have 'Evaluate Form' action.
+
+    The forms table is snapshotted once into a queue of pending row IDs; after
+    each submission only the submitted row is re-checked. Per-form outcomes go
+    to `run_log`'s detail file, not the page. Transient form failures are
+    re-queued with back-off; raises if any form still failed, TransientError
+    if all of those failures were transient.
+    """
+    timings = timings or StepTimings()
+    
+    # Forms submitted in an earlier run are skipped without opening them
+    done_forms = checkpoint.completed_forms(tender_id, tenderer_name) if checkpoint else set()
     
     try:
-        time.sleep(3)
+        with timings.step("forms: table load", tenderer=tenderer_name):
+            try:
+                wait_for_forms_table(driver)
+            except TimeoutException:
+                pass  # Reported below as "no form rows"
+        forms_url = driver.current_url
         
-        # Loop to process all pending forms
-        while True:
+        # Snapshot all form rows in the table with one script call
+        form_rows = extract_form_rows(driver)
+        
+        if not form_rows:
+            run_log.add(f"⚠️ NO FORM ROWS FOUND FOR {tenderer_name}")
+            return 0
+        
+        # Queue the forms that need evaluation (have an "Evaluate Form" link);
+        # ones already evaluated on the portal or in an earlier run are skipped
+        pending, forms_skipped = classify_form_rows(form_rows, done_forms)
+        forms = FormQueue(pending, tenderer_name, run_log, checkpoint, tender_id)
+        
+        while forms:
+            entry = forms.pop()
+            row_id, form_name, _, _ = entry
+            portal_throttle.wait()
             try:
-                # Find all form rows in the table
-                form_rows = driver.find_elements(By.XPATH, "//table[contains(@class,'tableList_1')]//tr[contains(@id,'fformtr_')]")
+                # Update status with current form being processed
+                if current_num and total_num:
+                    run_log.status(f"<h5 style='color: #ff0066;'>🔹 [{current_num}/{total_num}] FORM #{forms.processed + 1}: {form_name[:40]}...</h5>")
+                else:
+                    run_log.status(f"<h5 style='color: #ff0066;'>🔹 FORM #{forms.processed + 1}: {form_name[:50]}...</h5>")
                 
-                if not form_rows:
-                    st.warning(f"⚠️ NO FORM ROWS FOUND FOR {tenderer_name}")
-                    break
+                # Click the evaluate form link (re-located by row ID; the page reloads after each submit)
+                with timings.step("forms: open form", tenderer=tenderer_name, form=form_name):
+                    eval_form_link = driver.find_element(By.XPATH, f"//tr[@id='{row_id}']/td[3]//a[contains(text(),'Evaluate Form')]")
+                    driver.execute_script("arguments[0].scrollIntoView(true);", eval_form_link)
+                    with portal_limiter.paced(driver):
+                        eval_form_link.click()
+                        accept_radio = wait.until(EC.element_to_be_clickable((By.ID, "techQualify")))
                 
-                # Find a form that needs evaluation (has "Evaluate Form" link)
-                found_pending = False
-                for form_row in form_rows:
-                    try:
-                        action_cell = form_row.find_element(By.XPATH, ".//td[3]")  # Action column
-                        action_text = action_cell.text.strip()
+                if SCRIPTED_FORM_FILL:
+                    with timings.step("forms: fill and submit", tenderer=tenderer_name, form=form_name):
+                        portal_limiter.acquire(driver)
+                        submitted_at = time.perf_counter()
+                        filled = driver.execute_script(FILL_AND_SUBMIT_JS, remark_text)
+                        if filled.get("error") == "missing":
+                            raise NoSuchElementException("Evaluation form fields not found")
+                        if filled.get("error"):
+                            raise TransientError("Form fields did not keep the entered values")
+                        submit_btn = filled["button"]
+                else:
+                    # Fill out the form
+                    with timings.step("forms: fill form", tenderer=tenderer_name, form=form_name):
+                        driver.execute_script("arguments[0].click();", accept_radio)
                         
-                        # Check if this form has "Evaluate Form" link
-                        if "Evaluate Form" in action_text:
-                            # This form needs evaluation
-                            eval_form_link = action_cell.find_element(By.XPATH, ".//a[contains(text(),'Evaluate Form')]")
-                            
-                            # Get form name for logging
-                            try:
-                                form_name = form_row.find_element(By.XPATH, ".//td[1]//a").text.strip()
-                            except:
-                                form_name = "FORM"
-                            
-                            forms_processed += 1
-                            
-                            # Update status with current form being processed
-                            if current_num and total_num:
-                                status_text.markdown(
-                                    f"<h5 style='color: #ff0066;'>🔹 [{current_num}/{total_num}] FORM #{forms_processed}: {form_name[:40]}...</h5>", 
-                                    unsafe_allow_html=True
-                                )
-                            else:
-                                status_text.markdown(
-                                    f"<h5 style='color: #ff0066;'>🔹 FORM #{forms_processed}: {form_name[:50]}...</h5>", 
-                                    unsafe_allow_html=True
-                                )
-                            
-                            # Click the evaluate form link
-                            driver.execute_script("arguments[0].scrollIntoView(true);", eval_form_link)
-                            time.sleep(0.5)
-                            eval_form_link.click()
-                            time.sleep(3)
-                            
-                            # Fill out and submit the form
-                            accept_radio = wait.until(EC.element_to_be_clickable((By.ID, "techQualify")))
-                            driver.execute_script("arguments[0].click();", accept_radio)
-                            time.sleep(0.5)
-                            
-                            remark_box = driver.find_element(By.ID, "evalNonCompRemarks")
-                            remark_box.clear()
-                            remark_box.send_keys(remark_text)
-                            time.sleep(0.5)
-                            
-                            submit_btn = driver.find_element(By.ID, "btnPost")
-                            driver.execute_script("arguments[0].scrollIntoView(true);", submit_btn)
-                            time.sleep(0.5)
-                            submit_btn.click()
-                            
-                            # Handle any alerts
-                            try:
-                                WebDriverWait(driver, 2).until(EC.alert_is_present())
-                                alert = driver.switch_to.alert
-                                alert_text = alert.text
-                                alert.accept()
-                            except:
-                                pass
-                            
-                            st.success(f"   ✅ FORM #{forms_processed} SUBMITTED: {form_name[:60]}")
-                            
-                            # Wait for the page to automatically navigate back
-                            time.sleep(3)
-                            
-                            found_pending = True
-                            break  # Exit inner loop to re-check forms
-                            
-                        elif "Form Evaluated" in action_text:
-                            # This form is already evaluated, skip it
-                            forms_skipped += 1
-                    except:
-                        continue
-                
-                # If no pending forms found, we're done
-                if not found_pending:
-                    if forms_processed > 0:
-                        st.info(f"✅ COMPLETED {tenderer_name}: {forms_processed} forms processed, {forms_skipped} already evaluated")
-                    else:
-                        st.info(f"ℹ️ {tenderer_name}: All {forms_skipped} forms already evaluated")
-                    break
+                        remark_box = driver.find_element(By.ID, "evalNonCompRemarks")
+                        remark_box.clear()
+                        remark_box.send_keys(remark_text)
                     
+                    with timings.step("forms: submit", tenderer=tenderer_name, form=form_name):
+                        submit_btn = driver.find_element(By.ID, "btnPost")
+                        driver.execute_script("arguments[0].scrollIntoView(true);", submit_btn)
+                        portal_limiter.acquire(driver)
+                        submitted_at = time.perf_counter()
+                        submit_btn.click()
+                
+                # Wait for the page to automatically navigate back to the forms table;
+                # any dialog on the way has already been answered by the page-level capture
+                with timings.step("forms: reload table", tenderer=tenderer_name, form=form_name):
+                    wait_for_navigation(driver, submit_btn)
+                    wait_for_forms_table(driver)
+                portal_limiter.observe(time.perf_counter() - submitted_at)
+                for message in drain_dialogs(driver):
+                    run_log.detail(f"💬 {tenderer_name} - {form_name}: {message}")
+                
+                # Re-check only the row just submitted
+                action_text = driver.execute_script(ROW_ACTION_TEXT_JS, row_id) or ""
+                if "Form Evaluated" not in action_text:
+                    raise TransientError("Form not marked as evaluated after submit")
+                
+                forms.submitted(entry)
+                
             except Exception as inner_error:
-                st.error(f"   ❌ ERROR IN FORM PROCESSING LOOP: {str(inner_error)}")
-                break
+                # Return to the forms table; a post that went through before the error shows there as evaluated
+                load_page(driver, forms_url)
+                wait_for_forms_table(driver)
+                if "Form Evaluated" in (driver.execute_script(ROW_ACTION_TEXT_JS, row_id) or ""):
+                    forms.submitted(entry, confirmed_after=inner_error)
+                    continue
+                
+                # Transient failures go to the back of the queue, after a back-off
+                delay = forms.failed(entry, inner_error)
+                if delay is not None:
+                    time.sleep(delay)
     
     except Exception as e:
-        st.error(f"❌ ERROR PROCESSING FORMS FOR {tenderer_name}: {str(e)}")
+        run_log.add(f"❌ ERROR PROCESSING FORMS FOR {tenderer_name}: {str(e)[:80]}")
+        run_log.detail(f"❌ {tenderer_name}: {e}")
+        raise
     
-    return forms_processed
+    return forms.finish(forms_skipped)
 
-def run_automation(email, password, tender_id, remark_text, start_from=0):
-    """Main automation function"""
-    driver = None
-    csv_data = []
+def process_tenderer_forms_http(driver, session, remark_text, tenderer_name, run_log, current_num=None, total_num=None, timings=None, checkpoint=None, tender_id=None):
+    """HTTP fast path of process_tenderer_forms, using the browser's authenticated session.
+
+    The browser is only used for its cookies and the forms page URL; if a
+    submission does not come back as 'Form Evaluated', the remaining forms
+    are handed to the browser flow.
+    """
+    timings = timings or StepTimings()
+    forms_processed = 0
+    forms_skipped = 0
+    forms_url = driver.current_url
+    done_forms = checkpoint.completed_forms(tender_id, tenderer_name) if checkpoint else set()
     
     try:
-        # CSV Headers
-        csv_data.append(['Timestamp', 'Tenderer_Num', 'Tenderer_Name', 'Status', 'Forms_Count', 'Error'])
+        with timings.step("http: table load", tenderer=tenderer_name):
+            with portal_limiter.paced(driver):
+                rows = fetch_form_rows(session, forms_url)
         
-        # Initialize Chrome driver
-        driver = get_chrome_driver()
+        if not rows:
+            run_log.add(f"⚠️ NO FORM ROWS FOUND FOR {tenderer_name}")
+            return 0
+        
+        pending, forms_skipped = classify_form_rows(rows, done_forms)
+        for row_id, form_name, eval_link in pending:
+            if not eval_link:
+                # No usable link in the HTML; let the browser flow try (and fail) the form properly
+                raise Exception(f"No Evaluate Form link for {form_name[:40]}")
+            
+            if current_num and total_num:
+                run_log.status(f"<h5 style='color: #ff0066;'>🔹 [{current_num}/{total_num}] FORM #{forms_processed + 1}: {form_name[:40]}...</h5>")
+            
+            portal_throttle.wait()
+            with timings.step("http: submit form", tenderer=tenderer_name, form=form_name):
+                with portal_limiter.paced(driver, cost=2):  # Form GET + POST
+                    rows_after = submit_evaluation(session, forms_url, eval_link["href"], remark_text)
+            
+            # Re-check the row we just submitted
+            submitted = next((r for r in rows_after if r["id"] == row_id), None)
+            if submitted is None or "Form Evaluated" not in cell_text(submitted, 2):
+                raise Exception(f"Submission not confirmed for {form_name[:40]}")
+            
+            portal_throttle.record(True)
+            forms_processed += 1
+            if checkpoint:
+                checkpoint.mark_form_done(tender_id, tenderer_name, row_id, form_name)
+            
+            run_log.detail(f"✅ {tenderer_name} - FORM #{forms_processed} SUBMITTED: {form_name}")
+        
+        if checkpoint:
+            checkpoint.mark_tenderer_done(tender_id, tenderer_name, forms_processed)
+        run_log.detail(f"✅ COMPLETED {tenderer_name}: {forms_processed} forms processed, {forms_skipped} already evaluated")
+        return forms_processed
+    
+    except Exception as e:
+        portal_throttle.record(False)
+        run_log.add(f"⚠️ HTTP FAST PATH FAILED FOR {tenderer_name}: {str(e)[:60]} - FALLING BACK TO BROWSER")
+        load_page(driver, forms_url)
         wait = WebDriverWait(driver, 10)
+        return forms_processed + process_tenderer_forms(driver, wait, remark_text, tenderer_name, run_log, current_num, total_num, timings, checkpoint, tender_id)
+
+# --- Session & Tenderer Helpers ---
+def login(driver, email, password):
+    """Log in to eprocure and dismiss the update prompt. Returns True if the prompt was shown"""
+    wait = WebDriverWait(driver, 10)
+    portal_limiter.bind(driver, email)
+    load_page(driver, BASE_URL)
+    wait.until(EC.presence_of_element_located((By.ID, "txtEmailId")))
+
+    driver.find_element(By.ID, "txtEmailId").send_keys(email)
+    driver.find_element(By.ID, "txtPassword").send_keys(password)
+    click_and_wait_for_page(driver, driver.find_element(By.ID, "btnLogin"))
+
+    # Handle update prompt if exists
+    update_buttons = driver.find_elements(By.ID, "btnUpdateLater")
+    if update_buttons:
+        click_and_wait_for_page(driver, update_buttons[0])
+        return True
+    return False
+
+def session_is_valid(driver):
+    """Load one officer page; the session is valid if it renders instead of the login form"""
+    load_page(driver, BASE_URL + SESSION_CHECK_PATH)
+    return not driver.find_elements(By.ID, "txtEmailId") and bool(driver.find_elements(By.ID, "headTabTender"))
+
+def login_with_cookie_cache(driver, email, password):
+    """Reuse the account's cached session if it still works, otherwise log in and cache the new one.
 
-        driver.get("https://www.eprocure.gov.bd")
-        time.sleep(3)
+    Returns "restored", "prompt" (logged in, update prompt dismissed) or "login".
+    """
+    portal_limiter.bind(driver, email)
+    cookies = load_cookies(email, password)
+    if cookies:
+        restore_cookies(driver, cookies)
+        if session_is_valid(driver):
+            return "restored"
+        clear_cookies(email)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    
+    prompt_shown = login(driver, email, password)
+    save_cookies(email, password, snapshot_cookies(driver, urlsplit(BASE_URL).hostname))
+    return "prompt" if prompt_shown else "login"
+
+def start_session(driver, email, password, timings):
+    """Log in (or restore a cached session) and report how"""
+    with timings.step("login"):
+        session = login_with_cookie_cache(driver, email, password)
+    if session == "restored":
+        st.success("🍪 SESSION RESTORED FROM COOKIE CACHE - LOGIN SKIPPED")
+    elif session == "prompt":
+        st.success("✅ UPDATE PROMPT BYPASSED")
+    else:
+        st.info("⚡ NO UPDATE PROMPT DETECTED")
 
-        # Login
-        driver.find_element(By.ID, "txtEmailId").send_keys(email)
-        driver.find_element(By.ID, "txtPassword").send_keys(password)
-        driver.find_element(By.ID, "btnLogin").click()
-        time.sleep(5)
+def tenderer_action(row):
+    """(label, href) of the row's 'Evaluate Tenderer' or 'Edit' link; href is None if it is not a plain URL"""
+    for label in ("Evaluate Tenderer", "Edit"):
+        link = cell_link(row, 3, label)
+        if link:
+            href = link["href"]
+            return label, href if href and href.startswith("http") else None
+    return None, None
 
-        # Handle update prompt if exists
+def open_tenderer_evaluation(driver, tenderer_name, timings):
+    """Click the tenderer's 'Evaluate Tenderer' (or 'Edit') link. Returns the link label used"""
+    target_table = extract_tenderers_table(driver)
+    if not target_table:
+        raise Exception("Tenderers table not found")
+    
+    # Find the specific tenderer row by name
+    target_row = next((row for row in target_table["rows"] if cell_text(row, 1) == tenderer_name), None)
+    if not target_row:
+        raise Exception("Tenderer not found in table")
+    
+    # Click action link
+    for label in ("Evaluate Tenderer", "Edit"):
+        link = cell_link(target_row, 3, label)
+        if link:
+            driver.execute_script("arguments[0].scrollIntoView(true);", link["element"])
+            with timings.step("tenderer: open evaluation", tenderer=tenderer_name):
+                click_and_wait_for_page(driver, link["element"])
+            return label
+    
+    raise Exception("No action link found")
+
+def process_tenderers(driver, tenderers, total_tenderers, remark_text, timings, checkpoint=None, tender_id=None, fast_path=False, run_log=None, session=None):
+    """Evaluate each tenderer by opening its action link URL in the current tab.
+
+    `tenderers` yields (num, name, label, href) tuples collected from the
+    Clarification table. Tenderers without a usable href are reached by
+    navigating back to the table and clicking their link.
+    Yields ("start" | "log" | "result" | "failed", payload) events so the
+    caller can render progress; "result" payloads are CSV rows and "failed"
+    payloads are (tenderer tuple, transient) for the end-of-run retry.
+    `session` reuses a fast-path HTTP session built for `driver` earlier.
+    """
+    wait = WebDriverWait(driver, 10)
+    
+    # Pooled HTTP session sharing the browser's login, for the fast path
+    if fast_path and session is None:
+        session = session_from_driver(driver)
+    
+    run_log = run_log or RunLog()
+    
+    for tenderer in tenderers:
+        tenderer_num, tenderer_name, label, href = tenderer
+        yield from tenderer_started(tenderer, total_tenderers)
         try:
-            driver.find_element(By.ID, "btnUpdateLater").click()
-            st.success("✅ UPDATE PROMPT BYPASSED")
-        except:
-            st.info("⚡ NO UPDATE PROMPT DETECTED")
-
-        # INITIAL NAVIGATION: Navigate to Clarification tab to get tenderer count
-        st.info("🔄 INITIAL NAVIGATION TO CLARIFICATION PAGE...")
-        if not navigate_to_clarification(driver, tender_id):
-            raise Exception("Failed to navigate to Clarification page")
-        
-        st.success("✅ CLARIFICATION INTERFACE ACTIVE")
-        st.subheader("📊 DETECTING TENDERERS")
-        
-        # Find the tenderers table
-        tables = driver.find_elements(By.CSS_SELECTOR, "table.tableList_1")
-        target_table = None
-        
-        for table in tables:
+            portal_throttle.wait()
+            
+            if href:
+                with timings.step("tenderer: open evaluation", tenderer=tenderer_name):
+                    load_page(driver, href)
+            else:
+                # No direct URL (e.g. a javascript: link): click it from the Clarification table
+                yield ("log", f"📑 Opening via Clarification table: {tenderer_name[:50]}")
+                if not extract_tenderers_table(driver) and not navigate_to_clarification(driver, tender_id, timings):
+                    raise TransientError("Failed to navigate to Clarification page")
+                label = open_tenderer_evaluation(driver, tenderer_name, timings)
+            
+            if label == "Edit":
+                yield ("log", f"✅ FOUND 'EDIT' LINK (Already Evaluated)")
+            else:
+                yield ("log", f"✅ FOUND 'EVALUATE TENDERER' LINK")
+            
+            # Process forms
+            if session is not None:
+                forms_count = process_tenderer_forms_http(driver, session, remark_text, tenderer_name, run_log, tenderer_num, total_tenderers, timings, checkpoint, tender_id)
+            else:
+                forms_count = process_tenderer_forms(driver, wait, remark_text, tenderer_name, run_log, tenderer_num, total_tenderers, timings, checkpoint, tender_id)
+            
+            yield from tenderer_succeeded(tenderer, forms_count)
+            
+        except Exception as tenderer_error:
+            yield from tenderer_failed(tenderer, tenderer_error)
+
+# --- Worker Pool ---
+def run_worker_pool(email, password, tender_id, remark_text, driver, tenderer_info, total_tenderers, workers, timings, checkpoint=None, fast_path=False, run_log=None):
+    """Share `tenderer_info` across `workers` logged-in browsers.
+
+    `driver` is already on the Clarification tab and serves as worker 1; the
+    other workers take a pooled browser and log in, then open tenderers by URL.
+    A ConcurrencyController decides how many workers are active: paused
+    workers quit their browser and log in again on resuming, and a browser
+    past the memory ceiling is replaced between tenderers.
+    Events from all workers are yielded in the calling (Streamlit) thread.
+    """
+    tasks = queue.Queue()
+    for tenderer in tenderer_info:
+        tasks.put(tenderer)
+    events = queue.Queue()
+    controller = ConcurrencyController(workers, on_change=lambda message: events.put(("log", message)))
+    
+    def pending_tenderers():
+        while True:
             try:
-                headers = table.find_elements(By.TAG_NAME, "th")
-                header_texts = [h.text.strip() for h in headers]
-                
-                if ("S. No." in header_texts and 
-                    "List of Tenderers" in header_texts and 
-                    "Action" in header_texts):
-                    target_table = table
-                    break
-            except:
-                continue
-        
-        if not target_table:
-            st.error("❌ TENDERERS TABLE NOT FOUND IN SYSTEM")
-            raise Exception("Tenderers table not found")
-        
-        # Get total count of tenderers
-        tenderer_rows = target_table.find_elements(By.XPATH, ".//tr[position()>1 and td]")
-        total_tenderers = len(tenderer_rows)
-        
-        st.success(f"🎯 DETECTED {total_tenderers} TENDERERS FOR PROCESSING")
-        
-        # Apply skip/start_from logic
-        if start_from > 0:
-            if start_from >= total_tenderers:
-                st.error(f"❌ SKIP VALUE ({start_from}) IS GREATER THAN OR EQUAL TO TOTAL TENDERERS ({total_tenderers})")
+                yield tasks.get_nowait()
+            except queue.Empty:
                 return
-            st.warning(f"⏭️ SKIPPING FIRST {start_from} TENDERERS - STARTING FROM TENDERER #{start_from + 1}")
-        
-        # Collect all tenderer info upfront
-        st.info("📋 Collecting tenderer information...")
-        tenderer_info = []
-        for idx in range(start_from, total_tenderers):
-            try:
-                row = tenderer_rows[idx]
-                name = row.find_element(By.XPATH, ".//td[2]").text.strip()
-                tenderer_info.append((idx + 1, name))
-            except:
-                tenderer_info.append((idx + 1, f"TENDERER_{idx + 1}"))
-        
-        st.success(f"✅ Collected {len(tenderer_info)} tenderers")
-        
-        # Sidebar for progress and download
-        with st.sidebar:
-            st.subheader("📊 PROGRESS")
-            sidebar_progress = st.progress(0)
-            sidebar_status = st.empty()
-            st.divider()
-            st.subheader("💾 DOWNLOAD LOG")
-            st.info("⚠️ Download will be available after automation completes")
-            download_placeholder = st.empty()
-        
-        # Main area for logs (newest at top)
-        log_container = st.empty()
-        log_messages = []
-        
-        def update_logs():
-            """Update log display with current messages"""
-            log_html = ""
-            for msg in log_messages[:30]:  # Show last 30 messages
-                if "❌" in msg or "FAILED" in msg:
-                    color = "#ff0066"
-                elif "✅" in msg or "COMPLETED" in msg:
-                    color = "#00ff88"
-                else:
-                    color = "#00ffff"
-                log_html += f"<p style='color: {color}; font-size: 14px; margin: 2px 0;'>{msg}</p>"
-            log_container.markdown(log_html, unsafe_allow_html=True)
-        
-        successful_tenderers = 0
-        failed_tenderers = 0
-        skipped_tenderers = start_from
-        
-        # Store original window handle
-        original_window = driver.current_window_handle
-        
-        # Process each tenderer by opening in new duplicated tab
-        for i, (tenderer_num, tenderer_name) in enumerate(tenderer_info):
-            try:
-                # Update sidebar progress
-                sidebar_progress.progress((i + 1) / len(tenderer_info))
-                sidebar_status.markdown(f"**#{tenderer_num}/{total_tenderers}**")
-                
-                # Add to top of log messages
-                log_messages.insert(0, f"⚡ PROCESSING #{tenderer_num}/{total_tenderers}: {tenderer_name[:50]}")
-                update_logs()
-                
-                # Duplicate current tab
-                log_messages.insert(0, f"📑 Opening new tab for: {tenderer_name[:50]}")
-                update_logs()
-                
-                driver.execute_script("window.open(arguments[0]);", driver.current_url)
-                time.sleep(2)
-                
-                # Switch to new tab
-                new_window = [w for w in driver.window_handles if w != original_window][0]
-                driver.switch_to.window(new_window)
-                time.sleep(2)
-                
-                # Find tenderer table in new tab
-                tables = driver.find_elements(By.CSS_SELECTOR, "table.tableList_1")
-                target_table = None
-                
-                for table in tables:
-                    try:
-                        headers = table.find_elements(By.TAG_NAME, "th")
-                        header_texts = [h.text.strip() for h in headers]
-                        if ("S. No." in header_texts and "List of Tenderers" in header_texts):
-                            target_table = table
-                            break
-                    except:
-                        continue
-                
-                if not target_table:
-                    raise Exception("Table not found in new tab")
-                
-                # Find the specific tenderer row by name
-                tenderer_rows_new = target_table.find_elements(By.XPATH, ".//tr[position()>1 and td]")
-                target_row = None
-                
-                for row in tenderer_rows_new:
-                    try:
-                        name_cell = row.find_element(By.XPATH, ".//td[2]")
-                        if name_cell.text.strip() == tenderer_name:
-                            target_row = row
-                            break
-                    except:
-                        continue
-                
-                if not target_row:
-                    raise Exception("Tenderer not found in new tab")
-                
-                # Click action link
-                action_cell = target_row.find_element(By.XPATH, ".//td[4]")
-                
-                try:
-                    eval_link = action_cell.find_element(By.XPATH, ".//a[contains(text(),'Evaluate Tenderer')]")
-                    log_messages.insert(0, f"✅ FOUND 'EVALUATE TENDERER' LINK")
-                    update_logs()
-                    driver.execute_script("arguments[0].scrollIntoView(true);", eval_link)
-                    time.sleep(0.5)
-                    eval_link.click()
-                    time.sleep(4)
-                except:
-                    try:
-                        edit_link = action_cell.find_element(By.XPATH, ".//a[contains(text(),'Edit')]")
-                        log_messages.insert(0, f"✅ FOUND 'EDIT' LINK (Already Evaluated)")
-                        update_logs()
-                        driver.execute_script("arguments[0].scrollIntoView(true);", edit_link)
-                        time.sleep(0.5)
-                        edit_link.click()
-                        time.sleep(4)
-                    except:
-                        raise Exception("No action link found")
-                
-                # Process forms
-                status_text = st.empty()  # Dummy for compatibility
-                forms_count = process_tenderer_forms(driver, wait, remark_text, tenderer_name, status_text, tenderer_num, total_tenderers)
-                
-                # Log to CSV
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                csv_data.append([timestamp, tenderer_num, tenderer_name, "SUCCESS", forms_count, ""])
-                
-                # Close new tab and switch back to original
-                driver.close()
-                driver.switch_to.window(original_window)
-                time.sleep(1)
-                
-                log_messages.insert(0, f"✅ COMPLETED: {tenderer_name[:50]} ({forms_count} forms)")
-                update_logs()
-                
-                successful_tenderers += 1
-                
-                # Update CSV data in session state to avoid rerun issues
-                if 'csv_data' not in st.session_state:
-                    st.session_state.csv_data = []
-                st.session_state.csv_data = csv_data
-                
-            except Exception as tenderer_error:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                csv_data.append([timestamp, tenderer_num, tenderer_name, "FAILED", 0, str(tenderer_error)])
-                
-                log_messages.insert(0, f"❌ FAILED: {tenderer_name[:50]} - {str(tenderer_error)[:30]}")
-                update_logs()
-                
-                # Update CSV data in session state
-                if 'csv_data' not in st.session_state:
-                    st.session_state.csv_data = []
-                st.session_state.csv_data = csv_data
+    
+    def worker(worker_num):
+        worker_driver = driver if worker_num == 1 else None
+        session = None  # Fast-path HTTP session for worker_driver, built once per browser
+        try:
+            while controller.wait_for_turn(worker_num, tasks.empty):
+                if worker_driver is not None and worker_driver is not driver:
+                    rss = browser_over_ceiling(worker_driver)
+                    if rss is not None:
+                        events.put(("log", f"♻️ WORKER {worker_num} BROWSER AT {rss:.0f} MB - RECYCLING"))
+                        get_driver_pool().discard(worker_driver)
+                        worker_driver = session = None
+                if worker_driver is None:
+                    with timings.step("browser start"):
+                        worker_driver = get_driver_pool().acquire()
+                    with timings.step("login"):
+                        login(worker_driver, email, password)
+                    events.put(("log", f"🧵 WORKER {worker_num} READY"))
+                if fast_path and session is None:
+                    session = session_from_driver(worker_driver)
                 
-                # Make sure we're back on original window
-                try:
-                    driver.close()
-                except:
-                    pass
-                try:
-                    driver.switch_to.window(original_window)
-                except:
-                    pass
+                # One tenderer at a time, so the worker count is re-checked in between
+                tenderer = next(pending_tenderers(), None)
+                if tenderer is None:
+                    break
+                for event in process_tenderers(worker_driver, [tenderer], total_tenderers, remark_text, timings, checkpoint, tender_id, fast_path, run_log, session):
+                    events.put(event)
                 
-                failed_tenderers += 1
-                continue
+                if not controller.admits(worker_num) and worker_driver is not driver:
+                    # Paused: free the browser's memory until the worker is needed again
+                    events.put(("log", f"⏸️ WORKER {worker_num} PAUSED"))
+                    get_driver_pool().discard(worker_driver)
+                    worker_driver = session = None
+        except Exception as worker_error:
+            events.put(("log", f"❌ WORKER {worker_num} STOPPED: {str(worker_error)[:50]}"))
+        finally:
+            if worker_driver is not None and worker_driver is not driver:
+                get_driver_pool().release(worker_driver)
+            events.put(("done", worker_num))
+    
+    # Attach the Streamlit script context so st.* calls from workers render
+    ctx = get_script_run_ctx()
+    threads = []
+    for worker_num in range(1, workers + 1):
+        thread = threading.Thread(target=worker, args=(worker_num,), daemon=True)
+        add_script_run_ctx(thread, ctx)
+        thread.start()
+        threads.append(thread)
+    
+    running = workers
+    while running:
+        event = events.get()
+        if event[0] == "done":
+            running -= 1
+        else:
+            yield event
+    
+    for thread in threads:
+        thread.join()
+    
+    # Tenderers left over because every worker stopped go to the end-of-run retry
+    for tenderer in pending_tenderers():
+        yield from tenderer_unreached(tenderer, "No worker available")
+
+def build_progress_sidebar():
+    """Sidebar for progress and download. Returns (progress bar, status, download placeholder)"""
+    with st.sidebar:
+        st.subheader("📊 PROGRESS")
+        sidebar_progress = st.progress(0)
+        sidebar_status = st.empty()
+        st.divider()
+        st.subheader("💾 DOWNLOAD LOG")
+        st.info("⚠️ Download will be available after automation completes")
+        download_placeholder = st.empty()
+    return sidebar_progress, sidebar_status, download_placeholder
+
+def render_execution_summary(counts):
+    """Show tenderer totals for a finished tender"""
+    st.markdown(f"""
+    <div class="main-container">
+    <h3 style="text-align: center;">📊 EXECUTION SUMMARY</h3>
+    <p style="text-align: center; font-size: 18px;">
+    <strong>TOTAL TENDERERS:</strong> {counts['total']}<br>
+    <strong style="color: #ffc107;">SKIPPED:</strong> {counts['skipped']}<br>
+    <strong style="color: #00ff88;">SUCCESSFULLY PROCESSED:</strong> {counts['successful']}<br>
+    <strong style="color: #ff0066;">FAILED:</strong> {counts['failed']}
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def run_tender(driver, email, password, tender_id, remark_text, csv_log, timings, checkpoint, sidebar_progress, sidebar_status, start_from=0, workers=1, resume=True, fast_path=False, preflight=True, multi_tab=False):
+    """Evaluate every tenderer of one tender, starting from an already logged-in driver.
+
+    With `preflight`, a read-only scan first sizes each tenderer's pending
+    forms; tenderers with nothing pending are skipped and the rest run
+    largest first. With `multi_tab`, the workers are tabs of `driver`'s
+    browser instead of extra browsers. Result rows are appended to `csv_log`. Returns a dict of
+    tenderer counts (total, skipped, successful, failed), or None if there
+    was nothing to run.
+    """
+    if not resume:
+        # Still record progress, but skip nothing submitted in earlier runs
+        checkpoint = FreshRunCheckpoint(checkpoint)
+    
+    # INITIAL NAVIGATION: Navigate to Clarification tab to get tenderer count
+    st.info("🔄 INITIAL NAVIGATION TO CLARIFICATION PAGE...")
+    if not navigate_to_clarification(driver, tender_id, timings):
+        raise Exception("Failed to navigate to Clarification page")
+    
+    st.success("✅ CLARIFICATION INTERFACE ACTIVE")
+    st.subheader("📊 DETECTING TENDERERS")
+    
+    # Find the tenderers table
+    target_table = extract_tenderers_table(driver)
+    
+    if not target_table:
+        st.error("❌ TENDERERS TABLE NOT FOUND IN SYSTEM")
+        raise Exception("Tenderers table not found")
+    
+    # Get total count of tenderers
+    tenderer_rows = target_table["rows"]
+    total_tenderers = len(tenderer_rows)
+    
+    st.success(f"🎯 DETECTED {total_tenderers} TENDERERS FOR PROCESSING")
+    
+    # Apply skip/start_from logic
+    if start_from > 0:
+        if start_from >= total_tenderers:
+            st.error(f"❌ SKIP VALUE ({start_from}) IS GREATER THAN OR EQUAL TO TOTAL TENDERERS ({total_tenderers})")
+            return None
+        st.warning(f"⏭️ SKIPPING FIRST {start_from} TENDERERS - STARTING FROM TENDERER #{start_from + 1}")
+    
+    # Collect all tenderer info upfront, including each action link's URL for direct navigation
+    st.info("📋 Collecting tenderer information...")
+    tenderer_info = []
+    for idx in range(start_from, total_tenderers):
+        name = cell_text(tenderer_rows[idx], 1)
+        label, href = tenderer_action(tenderer_rows[idx])
+        tenderer_info.append((idx + 1, name or f"TENDERER_{idx + 1}", label, href))
+    
+    st.success(f"✅ Collected {len(tenderer_info)} tenderers")
+    
+    # Resume: drop tenderers completed in an earlier run (matched by name, not position)
+    resumed_tenderers = 0
+    if resume:
+        completed = checkpoint.completed_tenderers(tender_id)
+        if completed:
+            remaining = [tenderer for tenderer in tenderer_info if tenderer[1] not in completed]
+            resumed_tenderers = len(tenderer_info) - len(remaining)
+            tenderer_info = remaining
+            st.warning(f"♻️ RESUMING: {resumed_tenderers} TENDERERS ALREADY COMPLETED IN A PREVIOUS RUN")
+    
+    # Pre-flight: size the work, skip tenderers with nothing pending, run the largest first
+    idle_tenderers = []
+    if preflight and tenderer_info:
+        st.info("🛰️ PRE-FLIGHT SCAN OF TENDERER FORMS...")
+        plan = scan_tenderers(driver, tenderer_info, timings, checkpoint, tender_id)
+        render_work_plan(plan, estimate_runtime(plan, workers, fast_path, timings))
+        tenderer_info, idle_tenderers = order_work_plan(plan)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for tenderer_num, tenderer_name, _, _ in idle_tenderers:
+            checkpoint.mark_tenderer_done(tender_id, tenderer_name, 0)
+            csv_log.append([timestamp, tender_id, tenderer_num, tenderer_name, "SKIPPED", 0, "Nothing pending"])
+    
+    # Main area for logs (newest at top); per-form details go to a downloadable file
+    run_log = RunLog(label=tender_id)
+    
+    counts = {"total": total_tenderers, "skipped": start_from + resumed_tenderers + len(idle_tenderers), "successful": 0, "failed": 0}
+    sidebar_progress.progress(0)
+    
+    workers = max(1, min(workers, len(tenderer_info)))
+    if workers > 1 and multi_tab:
+        from cdp_engine import run_tab_pool
+        # Tenderers without an action URL can only be clicked from the table, so they run in the driver's tab afterwards
+        linked = [tenderer for tenderer in tenderer_info if tenderer[3]]
+        unlinked = [tenderer for tenderer in tenderer_info if not tenderer[3]]
+        tabs = min(workers, len(linked))
+        tab_events = ()
+        if tabs:
+            st.info(f"🗂️ STARTING {tabs} PARALLEL TABS IN ONE BROWSER...")
+            tab_events = run_tab_pool(driver, tender_id, remark_text, linked, total_tenderers, tabs, timings, checkpoint, run_log)
+        events = itertools.chain(
+            tab_events,
+            process_tenderers(driver, unlinked, total_tenderers, remark_text, timings, checkpoint, tender_id, fast_path, run_log),
+        )
+    elif workers > 1:
+        st.info(f"🧵 STARTING {workers} PARALLEL BROWSER WORKERS...")
+        events = run_worker_pool(email, password, tender_id, remark_text, driver, tenderer_info, total_tenderers, workers, timings, checkpoint, fast_path, run_log)
+    else:
+        events = process_tenderers(driver, tenderer_info, total_tenderers, remark_text, timings, checkpoint, tender_id, fast_path, run_log)
+    
+    outcomes = {}  # Tenderer number -> latest status
+    retryable = {}  # Tenderer number -> tenderer tuple, for transient failures
+    
+    def consume(events):
+        for kind, payload in events:
+            if kind == "start":
+                tenderer_num, tenderer_name = payload
+                sidebar_status.markdown(f"**{tender_id} · #{tenderer_num}/{total_tenderers}**")
+            elif kind == "log":
+                run_log.add(payload)
+            elif kind == "failed":
+                tenderer, transient = payload
+                if transient:
+                    retryable[tenderer[0]] = tenderer
+            elif kind == "result":
+                # Log to CSV (a retried tenderer gets one row per attempt)
+                timestamp, tenderer_num, tenderer_name, status, forms_count, error = payload
+                csv_log.append([timestamp, tender_id, tenderer_num, tenderer_name, status, forms_count, error])
+                outcomes[tenderer_num] = status
+                if status == "SUCCESS":
+                    retryable.pop(tenderer_num, None)
+                sidebar_progress.progress(len(outcomes) / len(tenderer_info))
+    
+    try:
+        consume(events)
+        
+        # Retry transient failures at the end, each round from a fresh navigation
+        for retry_round in range(RETRY_ROUNDS):
+            if not retryable:
+                break
+            delay = backoff_delay(retry_round)
+            run_log.add(f"🔁 RETRY ROUND {retry_round + 1}: {len(retryable)} TENDERERS IN {delay:.0f}s")
+            time.sleep(delay)
+            if not navigate_to_clarification(driver, tender_id, timings):
+                run_log.add("❌ RETRY ROUND ABORTED: CLARIFICATION PAGE UNREACHABLE")
+                break
+            retry_tenderers = sorted(retryable.values())
+            retryable.clear()
+            consume(process_tenderers(driver, retry_tenderers, total_tenderers, remark_text, timings, checkpoint, tender_id, fast_path, run_log))
+    finally:
+        run_log.close()
+        run_log.offer_download()
+    
+    counts["successful"] = sum(status == "SUCCESS" for status in outcomes.values())
+    counts["failed"] = len(outcomes) - counts["successful"]
+    return counts
+
+def run_automation(email, password, tender_id, remark_text, start_from=0, workers=1, resume=True, fast_path=False, preflight=True, multi_tab=False):
+    """Main automation function. Returns True if the run completed"""
+    driver = None
+    download_placeholder = None
+    timings = StepTimings()
+    checkpoint = CheckpointStore()
+    csv_log = CsvLog(tender_id, CSV_HEADER)
+    page_loads.reset()
+    
+    try:
+        # Initialize Chrome driver
+        with timings.step("browser start"):
+            driver = get_driver_pool().acquire()
+
+        start_session(driver, email, password, timings)
+
+        sidebar_progress, sidebar_status, download_placeholder = build_progress_sidebar()
         
-        # Store final CSV data
-        st.session_state.csv_data = csv_data
+        counts = run_tender(driver, email, password, tender_id, remark_text, csv_log, timings, checkpoint,
+                            sidebar_progress, sidebar_status, start_from, workers, resume, fast_path, preflight, multi_tab)
+        if counts is None:
+            return False
         
         sidebar_progress.progress(1.0)
         sidebar_status.markdown("**✅ COMPLETE**")
         
-        # Now show download button (won't cause rerun since automation is done)
-        csv_buffer = io.StringIO()
-        writer = csv.writer(csv_buffer)
-        writer.writerows(csv_data)
-        
-        download_placeholder.download_button(
-            label=f"📥 Download Log ({len(csv_data)-1} entries)",
-            data=csv_buffer.getvalue(),
-            file_name=f"log_{tender_id}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-            mime="text/csv"
-        )
-        
         st.success("🎯 AUTOMATION SUCCESSFULLY EXECUTED")
-        st.markdown(f"""
-        <div class="main-container">
-        <h3 style="text-align: center;">📊 EXECUTION SUMMARY</h3>
-        <p style="text-align: center; font-size: 18px;">
-        <strong>TOTAL TENDERERS:</strong> {total_tenderers}<br>
-        <strong style="color: #ffc107;">SKIPPED:</strong> {skipped_tenderers}<br>
-        <strong style="color: #00ff88;">SUCCESSFULLY PROCESSED:</strong> {successful_tenderers}<br>
-        <strong style="color: #ff0066;">FAILED:</strong> {failed_tenderers}
-        </p>
-        </div>
-        """, unsafe_allow_html=True)
+        render_execution_summary(counts)
+        render_latency_report(timings, tender_id)
+        render_resource_report()
+        return True
 
     except Exception as e:
         st.error(f"❌ SYSTEM FAILURE: {e}")
         import traceback
         st.error(traceback.format_exc())
+        return False
     finally:
         if driver is not None:
-            st.info("🔄 BROWSER SHUTDOWN IN 10 SECONDS...")
-            time.sleep(10)
-            driver.quit()
-            st.info("✅ BROWSER TERMINATED")
\ No newline at end of file
+            get_driver_pool().release(driver)
+            st.info("✅ BROWSER RETURNED TO POOL")
+        checkpoint.close()
+        # The CSV is on disk row by row, so it is offered even if the run failed
+        csv_log.close()
+        if download_placeholder is not None:
+            csv_log.offer_download(download_placeholder)
\ No newline at end of file
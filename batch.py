@@ -0,0 +1,130 @@
+from reporting import st
+from selenium.webdriver.common.by import By
+from automation import (
+    login_with_cookie_cache, start_session, run_tender, build_progress_sidebar,
+    render_execution_summary, BASE_URL, CSV_HEADER,
+)
+from checkpoint import CheckpointStore
+from driver_pool import get_driver_pool
+from timing import StepTimings, render_latency_report
+from resource_policy import page_loads, render_resource_report
+from run_log import CsvLog
+from waits import load_page
+from concurrency import browser_over_ceiling
+
+STATUS_COLORS = {"PENDING": "#ffc107", "RUNNING": "#00ffff", "DONE": "#00ff88", "FAILED": "#ff0066"}
+
+def render_tender_queue(placeholder, queue_rows):
+    """Show the batch queue with each tender's status"""
+    table_rows = "".join(
+        f"<tr><td>{row['tender_id']}</td>"
+        f"<td style='color: {STATUS_COLORS.get(row['status'], '#00ffff')};'>{row['status']}</td>"
+        f"<td>{row['detail']}</td><td>{row['updated_at']}</td></tr>"
+        for row in queue_rows
+    )
+    placeholder.markdown(f"""
+    <div class="main-container">
+    <h3 style="text-align: center;">🗂️ TENDER QUEUE</h3>
+    <table style="width: 100%; color: #00ffff;">
+    <tr><th>TENDER ID</th><th>STATUS</th><th>DETAIL</th><th>UPDATED</th></tr>
+    {table_rows}
+    </table>
+    </div>
+    """, unsafe_allow_html=True)
+
+def run_batch(email, password, jobs, workers=1, resume=True, fast_path=False, preflight=True, multi_tab=False):
+    """Evaluate several tenders with a single login, tracking each in the persistent tender queue.
+
+    Returns True if the batch ran to the end (individual tenders may still have failed).
+    """
+    driver = None
+    download_placeholder = None
+    csv_log = CsvLog("batch", CSV_HEADER)
+    timings = StepTimings()
+    checkpoint = CheckpointStore()
+    page_loads.reset()
+    tender_ids = [tender_id for tender_id, _ in jobs]
+
+    try:
+        # DONE tenders stay done when resuming; everything else is (re)queued
+        checkpoint.enqueue_tenders(jobs, requeue_done=not resume)
+        statuses = {row["tender_id"]: row["status"] for row in checkpoint.tender_queue(tender_ids)}
+        pending_jobs = [(tender_id, remark) for tender_id, remark in jobs if statuses.get(tender_id) != "DONE"]
+
+        queue_placeholder = st.empty()
+        render_tender_queue(queue_placeholder, checkpoint.tender_queue(tender_ids))
+
+        if not pending_jobs:
+            st.info("ℹ️ ALL TENDERS IN THIS BATCH ARE ALREADY DONE")
+            return True
+
+        st.info(f"🗂️ BATCH OF {len(pending_jobs)} TENDERS QUEUED")
+
+        # Initialize Chrome driver and log in once for the whole batch
+        with timings.step("browser start"):
+            driver = get_driver_pool().acquire()
+
+        start_session(driver, email, password, timings)
+
+        sidebar_progress, sidebar_status, download_placeholder = build_progress_sidebar()
+
+        for job_num, (tender_id, remark_text) in enumerate(pending_jobs, start=1):
+            st.subheader(f"🗂️ TENDER {job_num}/{len(pending_jobs)}: {tender_id}")
+            checkpoint.set_tender_status(tender_id, "RUNNING")
+            render_tender_queue(queue_placeholder, checkpoint.tender_queue(tender_ids))
+
+            try:
+                counts = run_tender(driver, email, password, tender_id, remark_text, csv_log, timings, checkpoint,
+                                    sidebar_progress, sidebar_status, workers=workers, resume=resume, fast_path=fast_path, preflight=preflight, multi_tab=multi_tab)
+                if counts is None:
+                    status, detail = "DONE", "No tenderers to process"
+                else:
+                    render_execution_summary(counts)
+                    status = "DONE" if counts["failed"] == 0 else "FAILED"
+                    detail = f"{counts['successful']} processed, {counts['failed']} failed, {counts['skipped']} skipped"
+            except Exception as tender_error:
+                status, detail = "FAILED", str(tender_error)[:200]
+                st.error(f"❌ TENDER {tender_id} FAILED: {tender_error}")
+
+                # Get back to a logged-in page for the next tender
+                try:
+                    load_page(driver, BASE_URL)
+                    if driver.find_elements(By.ID, "txtEmailId"):
+                        login_with_cookie_cache(driver, email, password)
+                except Exception:
+                    pass
+
+            checkpoint.set_tender_status(tender_id, status, detail)
+            render_tender_queue(queue_placeholder, checkpoint.tender_queue(tender_ids))
+
+            # Replace the shared browser before the next tender if it has grown past the memory ceiling
+            rss = browser_over_ceiling(driver)
+            if rss is not None and job_num < len(pending_jobs):
+                st.info(f"♻️ BROWSER AT {rss:.0f} MB - RECYCLING BEFORE THE NEXT TENDER")
+                get_driver_pool().discard(driver)
+                driver = None
+                with timings.step("browser start"):
+                    driver = get_driver_pool().acquire()
+                start_session(driver, email, password, timings)
+
+        sidebar_progress.progress(1.0)
+        sidebar_status.markdown("**✅ BATCH COMPLETE**")
+
+        st.success("🎯 BATCH SUCCESSFULLY EXECUTED")
+        render_latency_report(timings, "batch")
+        render_resource_report()
+        return True
+
+    except Exception as e:
+        st.error(f"❌ SYSTEM FAILURE: {e}")
+        import traceback
+        st.error(traceback.format_exc())
+        return False
+    finally:
+        if driver is not None:
+            get_driver_pool().release(driver)
+            st.info("✅ BROWSER RETURNED TO POOL")
+        checkpoint.close()
+        csv_log.close()
+        if download_placeholder is not None:
+            csv_log.offer_download(download_placeholder)
@@ -0,0 +1,21 @@
+import csv
+import io
+
+# Tender list parsing for batch mode. Kept free of Selenium and the automation
+# modules so the app server can validate a batch without importing them.
+
+def parse_batch_jobs(text, default_remark):
+    """Parse 'tender_id[, remark]' lines (or a CSV with those columns) into (tender_id, remark) jobs"""
+    jobs = []
+    seen = set()
+    for row in csv.reader(io.StringIO(text)):
+        if not row or not row[0].strip() or row[0].strip().startswith("#"):
+            continue
+        tender_id = row[0].strip()
+        if tender_id.lower().replace(" ", "_") == "tender_id":
+            continue  # Header row of an uploaded CSV
+        remark = row[1].strip() if len(row) > 1 and row[1].strip() else default_remark
+        if tender_id not in seen:
+            seen.add(tender_id)
+            jobs.append((tender_id, remark))
+    return jobs
@@ -0,0 +1,92 @@
+# Offline throughput benchmark: runs the real automation end to end in a
+# headless browser against mock_portal.py and reports tenderers/min and
+# forms/min. Injected latency approximates the live portal, so speedups can be
+# checked before they are tried on production.
+#
+# Usage: python benchmark.py --tenderers 10 --forms 8 --latency-ms 150 [--workers 2 [--tabs]] [--fast-path]
+import argparse
+import os
+import tempfile
+import time
+from mock_portal import MockPortal
+
+def run_benchmark(tenders=1, tenderers=5, forms=8, latency_ms=0, jitter_ms=0, workers=1,
+                  fast_path=False, update_prompt=False, confirm_dialog=False, verbose=False, multi_tab=False):
+    """Run the automation against a fresh mock portal. Returns a dict of results"""
+    portal = MockPortal(tenders, tenderers, forms, latency_ms, jitter_ms, update_prompt, confirm_dialog).serve_in_background()
+
+    # Point the automation at the mock and keep its state out of the real stores.
+    # Must happen before the automation modules are imported: they read these at import time.
+    state_dir = tempfile.mkdtemp(prefix="eprocure_bench_")
+    os.environ["EPROCURE_BASE_URL"] = portal.base_url
+    os.environ["CHECKPOINT_DB"] = os.path.join(state_dir, "checkpoints.db")
+    os.environ["COOKIE_CACHE_DIR"] = os.path.join(state_dir, "cookies")
+    os.environ["RESOURCE_BASELINE"] = os.path.join(state_dir, "resource_baseline.json")
+    os.environ["RATE_LIMIT_DB"] = os.path.join(state_dir, "rate_limit.db")
+
+    from reporting import set_reporter, ConsoleReporter
+    set_reporter(ConsoleReporter(verbose))
+    from automation import run_automation
+    from batch import run_batch
+    from driver_pool import get_driver_pool
+
+    # Launch the browser before the clock starts, as the app's warm pool does
+    get_driver_pool().warm_up()
+
+    credentials = {"email": "bench@example.com", "password": "bench"}
+    start = time.perf_counter()
+    if len(portal.tender_ids) == 1:
+        ok = run_automation(**credentials, tender_id=portal.tender_ids[0], remark_text="Benchmark",
+                            workers=workers, resume=False, fast_path=fast_path, multi_tab=multi_tab)
+    else:
+        jobs = [(tender_id, "Benchmark") for tender_id in portal.tender_ids]
+        ok = run_batch(**credentials, jobs=jobs, workers=workers, resume=False, fast_path=fast_path, multi_tab=multi_tab)
+    elapsed = time.perf_counter() - start
+
+    completed_tenderers = portal.completed_tenderers()
+    evaluated_forms = len(portal.evaluated)
+    portal.shutdown()
+    minutes = elapsed / 60
+    return {
+        "ok": ok,
+        "seconds": elapsed,
+        "tenderers": completed_tenderers,
+        "total_tenderers": len(portal.tender_ids) * tenderers,
+        "forms": evaluated_forms,
+        "total_forms": portal.total_forms,
+        "requests": portal.requests,
+        "tenderers_per_min": completed_tenderers / minutes if minutes else 0.0,
+        "forms_per_min": evaluated_forms / minutes if minutes else 0.0,
+    }
+
+def print_results(results):
+    status = "OK" if results["ok"] and results["forms"] == results["total_forms"] else "INCOMPLETE"
+    print(f"\n{'=' * 48}")
+    print(f"RUN STATUS        {status}")
+    print(f"ELAPSED           {results['seconds']:.1f}s")
+    print(f"TENDERERS         {results['tenderers']}/{results['total_tenderers']}")
+    print(f"FORMS             {results['forms']}/{results['total_forms']}")
+    print(f"PORTAL REQUESTS   {results['requests']}")
+    print(f"TENDERERS/MIN     {results['tenderers_per_min']:.1f}")
+    print(f"FORMS/MIN         {results['forms_per_min']:.1f}")
+    print("=" * 48)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the automation against a local mock portal")
+    parser.add_argument("--tenders", type=int, default=1, help="more than one runs the batch mode")
+    parser.add_argument("--tenderers", type=int, default=5, help="tenderers per tender")
+    parser.add_argument("--forms", type=int, default=8, help="forms per tenderer")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every portal response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- variation of the delay")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--fast-path", action="store_true", help="submit forms over HTTP")
+    parser.add_argument("--tabs", action="store_true", help="run the workers as tabs of one browser")
+    parser.add_argument("--update-prompt", action="store_true")
+    parser.add_argument("--confirm-dialog", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="print every automation message")
+    args = parser.parse_args()
+
+    print_results(run_benchmark(
+        args.tenders, args.tenderers, args.forms, args.latency_ms, args.jitter_ms, args.workers,
+        args.fast_path, args.update_prompt, args.confirm_dialog, args.verbose, args.tabs,
+    ))
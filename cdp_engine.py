@@ -0,0 +1,320 @@
+import asyncio
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import deque
+from urllib.request import urlopen
+import websockets
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from automation import FILL_AND_SUBMIT_JS, ROW_ACTION_TEXT_JS
+from dialogs import DIALOG_CAPTURE_JS, DRAIN_DIALOGS_JS
+from extract import TABLES_JS, classify_form_rows
+from rate_limit import portal_limiter
+from resource_policy import RESOURCE_BLOCKING, blocked_url_patterns
+from retry import TransientError, portal_throttle
+from outcomes import FormQueue, tenderer_started, tenderer_succeeded, tenderer_failed, tenderer_unreached
+from run_log import RunLog
+from concurrency import ConcurrencyController, TAB_MEMORY_MB
+
+# Multi-tab engine: drives several tabs of the already logged-in Chrome at once
+# over one DevTools websocket, so extra workers cost a tab, not a browser.
+# Tabs share the browser's cookies; tenderers are opened by their action URL.
+PAGE_LOAD_TIMEOUT = 15
+
+class CdpError(Exception):
+    """A DevTools command failed"""
+
+def debugger_address(driver):
+    """host:port of the DevTools endpoint of a chromedriver-launched browser"""
+    address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not address:
+        raise CdpError("Browser does not expose a DevTools address")
+    return address
+
+class CdpConnection:
+    """One browser-level DevTools websocket; each tab is a flat session multiplexed over it"""
+
+    def __init__(self, socket):
+        self._socket = socket
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, address):
+        version = await asyncio.to_thread(lambda: json.load(urlopen(f"http://{address}/json/version", timeout=10)))
+        return cls(await websockets.connect(version["webSocketDebuggerUrl"], max_size=None))
+
+    async def send(self, method, params=None, session_id=None):
+        message = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        reply = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = reply
+        await self._socket.send(json.dumps(message))
+        return await reply
+
+    def listen(self, session_id, callback):
+        """Call `callback(method, params)` for every event of the session"""
+        self._listeners[session_id] = callback
+
+    async def _read(self):
+        try:
+            async for raw in self._socket:
+                message = json.loads(raw)
+                if "id" in message:
+                    reply = self._pending.pop(message["id"], None)
+                    if reply is None or reply.done():
+                        continue
+                    if "error" in message:
+                        reply.set_exception(CdpError(message["error"].get("message", "DevTools error")))
+                    else:
+                        reply.set_result(message.get("result", {}))
+                elif message.get("sessionId") in self._listeners:
+                    self._listeners[message["sessionId"]](message["method"], message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for reply in self._pending.values():
+                if not reply.done():
+                    reply.set_exception(TransientError("DevTools connection closed"))
+            self._pending.clear()
+
+    async def close(self):
+        await self._socket.close()
+        self._reader.cancel()
+
+class Tab:
+    """A browser tab attached over a CdpConnection, with the app's dialog and resource policy"""
+
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.dialogs = []
+        self._loaded = asyncio.Event()
+        self._loader_id = None
+
+    @classmethod
+    async def open(cls, connection):
+        target = await connection.send("Target.createTarget", {"url": "about:blank", "background": True})
+        attached = await connection.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        tab = cls(connection, target["targetId"], attached["sessionId"])
+        connection.listen(tab.session_id, tab._on_event)
+        await tab.send("Page.enable")
+        await tab.send("Page.setLifecycleEventsEnabled", {"enabled": True})
+        await tab.send("Page.addScriptToEvaluateOnNewDocument", {"source": DIALOG_CAPTURE_JS})
+        if RESOURCE_BLOCKING:
+            await tab.send("Network.enable")
+            await tab.send("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+        return tab
+
+    def send(self, method, params=None):
+        return self.connection.send(method, params, self.session_id)
+
+    def _on_event(self, method, params):
+        if method == "Page.lifecycleEvent" and params.get("name") == "load" and params.get("frameId") == self.target_id:
+            # Load of the tab's main document (its frame ID is the target ID)
+            self._loader_id = params.get("loaderId")
+            self._loaded.set()
+        elif method == "Page.javascriptDialogOpening":
+            # Native dialog the in-page capture missed: answer it right away
+            self.dialogs.append(f"{params.get('type')}: {params.get('message')}")
+            asyncio.ensure_future(self.send("Page.handleJavaScriptDialog", {"accept": True}))
+
+    def expect_load(self):
+        """Arm wait_for_load for the next page load"""
+        self._loaded.clear()
+
+    async def wait_for_load(self, timeout=PAGE_LOAD_TIMEOUT):
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TransientError("Page load timed out")
+
+    async def navigate(self, url, timeout=PAGE_LOAD_TIMEOUT):
+        """Load `url` and wait for that document's load, ignoring late loads of the previous one"""
+        deadline = time.monotonic() + timeout
+        self.expect_load()
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise TransientError(f"Navigation failed: {result['errorText']}")
+        while True:
+            await self.wait_for_load(max(0.0, deadline - time.monotonic()))
+            if result.get("loaderId") in (None, self._loader_id):
+                return
+            self.expect_load()
+
+    async def evaluate(self, script, *args):
+        """Run a function body (using `arguments`) in the page and return its JSON value"""
+        expression = f"(function () {{{script}}}).apply(null, {json.dumps(args)})"
+        result = await self.send("Runtime.evaluate", {"expression": expression, "returnByValue": True})
+        if "exceptionDetails" in result:
+            raise CdpError(result["exceptionDetails"].get("text", "Script failed"))
+        return result["result"].get("value")
+
+    async def drain_dialogs(self):
+        """Dialog messages since the last call, from the in-page capture and the native handler"""
+        seen = await self.evaluate(DRAIN_DIALOGS_JS)
+        messages = self.dialogs + (json.loads(seen) if seen else [])
+        self.dialogs = []
+        return messages
+
+    async def close(self):
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+
+async def _paced(driver, operation, cost=1):
+    """Await `operation` under the portal rate limiter, charged to the driver's account"""
+    await asyncio.to_thread(portal_limiter.acquire, driver, cost)
+    start = time.perf_counter()
+    try:
+        return await operation
+    finally:
+        portal_limiter.observe(time.perf_counter() - start)
+
+async def evaluate_tenderer_in_tab(tab, driver, tenderer, remark_text, timings, run_log, checkpoint=None, tender_id=None):
+    """Tab counterpart of process_tenderer_forms: open each pending form by URL, fill and post it in one script"""
+    _, tenderer_name, _, href = tenderer
+    done_forms = checkpoint.completed_forms(tender_id, tenderer_name) if checkpoint else set()
+
+    with timings.step("tenderer: open evaluation", tenderer=tenderer_name):
+        await _paced(driver, tab.navigate(href))
+    form_rows = []
+    for table in await tab.evaluate(TABLES_JS, "table.tableList_1", "tr[id*='fformtr_']"):
+        form_rows.extend(table["rows"])
+    if not form_rows:
+        run_log.add(f"⚠️ NO FORM ROWS FOUND FOR {tenderer_name}")
+        return 0
+
+    pending, forms_skipped = classify_form_rows(form_rows, done_forms)
+    if any(not link or not link["href"].startswith("http") for _, _, link in pending):
+        # A form without an Evaluate Form URL can only be clicked; leave the tenderer to the browser retry
+        raise TransientError("Form without an Evaluate Form URL - left to the browser flow")
+    forms = FormQueue(pending, tenderer_name, run_log, checkpoint, tender_id)
+
+    async def fill_and_submit():
+        tab.expect_load()
+        filled = await tab.evaluate(FILL_AND_SUBMIT_JS, remark_text)
+        if filled.get("error") == "missing":
+            raise CdpError("Evaluation form fields not found")
+        if filled.get("error"):
+            raise TransientError("Form fields did not keep the entered values")
+        await tab.wait_for_load()
+
+    while forms:
+        entry = forms.pop()
+        row_id, form_name, link, _ = entry
+        await asyncio.to_thread(portal_throttle.wait)
+        try:
+            with timings.step("forms: open form", tenderer=tenderer_name, form=form_name):
+                await _paced(driver, tab.navigate(link["href"]))
+            with timings.step("forms: fill and submit", tenderer=tenderer_name, form=form_name):
+                await _paced(driver, fill_and_submit())
+            for message in await tab.drain_dialogs():
+                run_log.detail(f"💬 {tenderer_name} - {form_name}: {message}")
+
+            action_text = await tab.evaluate(ROW_ACTION_TEXT_JS, row_id) or ""
+            if "Form Evaluated" not in action_text:
+                raise TransientError("Form not marked as evaluated after submit")
+            forms.submitted(entry)
+
+        except Exception as inner_error:
+            # Reload the forms table before any re-post: the post may have gone through before the error
+            await _paced(driver, tab.navigate(href))
+            if "Form Evaluated" in (await tab.evaluate(ROW_ACTION_TEXT_JS, row_id) or ""):
+                forms.submitted(entry, confirmed_after=inner_error)
+                continue
+
+            delay = forms.failed(entry, inner_error)
+            if delay is not None:
+                await asyncio.sleep(delay)
+
+    return forms.finish(forms_skipped)
+
+def run_tab_pool(driver, tender_id, remark_text, tenderer_info, total_tenderers, tabs, timings, checkpoint=None, run_log=None):
+    """Share `tenderer_info` (tenderers with an action URL) across `tabs` tabs of the driver's browser.
+
+    Yields the same events as process_tenderers. The number of open tabs
+    follows a ConcurrencyController watching the shared browser's memory; a
+    paused tab is closed until it is needed again. The driver's own tab is left
+    alone; tenderers not reached because the engine stopped are reported as
+    transient failures so the end-of-run retry picks them up in the browser.
+    """
+    run_log = run_log or RunLog()
+    pending = deque(tenderer_info)
+    tabs = max(1, min(tabs, len(tenderer_info)))
+    events = queue.Queue()
+    controller = ConcurrencyController(tabs, TAB_MEMORY_MB, driver, on_change=lambda message: events.put(("log", message)))
+
+    async def tab_worker(connection, tab_num):
+        tab = None
+        try:
+            while pending:
+                # admits() may read /proc for the browser's memory; keep it off the event loop
+                if not await asyncio.to_thread(controller.admits, tab_num):
+                    if tab is not None:
+                        # Paused: close the tab so its renderer's memory is freed
+                        events.put(("log", f"⏸️ TAB {tab_num} PAUSED"))
+                        await tab.close()
+                        tab = None
+                    await asyncio.sleep(controller.check_seconds)
+                    continue
+                if tab is None:
+                    tab = await Tab.open(connection)
+                    events.put(("log", f"🗂️ TAB {tab_num} READY"))
+                if not pending:
+                    break  # Another tab took the last tenderer while this one was opening
+                tenderer = pending.popleft()
+                for event in tenderer_started(tenderer, total_tenderers):
+                    events.put(event)
+                try:
+                    await asyncio.to_thread(portal_throttle.wait)
+                    forms_count = await evaluate_tenderer_in_tab(tab, driver, tenderer, remark_text, timings, run_log, checkpoint, tender_id)
+                    outcome = tenderer_succeeded(tenderer, forms_count)
+                except Exception as tenderer_error:
+                    outcome = tenderer_failed(tenderer, tenderer_error)
+                for event in outcome:
+                    events.put(event)
+        finally:
+            if tab is not None:
+                try:
+                    await tab.close()
+                except Exception:
+                    pass
+
+    async def main():
+        connection = await CdpConnection.connect(debugger_address(driver))
+        try:
+            stopped = await asyncio.gather(*(tab_worker(connection, tab_num) for tab_num in range(1, tabs + 1)), return_exceptions=True)
+            for tab_num, error in enumerate(stopped, 1):
+                if isinstance(error, Exception):
+                    events.put(("log", f"❌ TAB {tab_num} STOPPED: {str(error)[:50]}"))
+        finally:
+            await connection.close()
+
+    def engine():
+        try:
+            asyncio.run(main())
+        except Exception as engine_error:
+            events.put(("log", f"❌ TAB ENGINE STOPPED: {str(engine_error)[:50]}"))
+        finally:
+            events.put(("done", None))
+
+    # Attach the Streamlit script context so st.* calls from the engine render
+    thread = threading.Thread(target=engine, daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+    while True:
+        event = events.get()
+        if event[0] == "done":
+            break
+        yield event
+    thread.join()
+
+    # Tenderers left over because the engine stopped go to the browser retry round
+    for tenderer in pending:
+        yield from tenderer_unreached(tenderer, "No tab available")
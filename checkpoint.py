@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Local on-disk store; survives Streamlit session loss and app restarts
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "checkpoints.db")
+
+class CheckpointStore:
+    """Persistent record of submitted forms and completed tenderers per tender"""
+
+    def __init__(self, path=CHECKPOINT_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        # Shared by worker threads; every access goes through self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            # Forms are keyed by their fformtr_ row ID: names repeat, or are missing, within a tenderer.
+            # (The older name-keyed `forms` table of earlier versions is no longer read.)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS form_checkpoints (
+                    tender_id TEXT NOT NULL,
+                    tenderer_name TEXT NOT NULL,
+                    form_key TEXT NOT NULL,
+                    form_name TEXT NOT NULL,
+                    submitted_at TEXT NOT NULL,
+                    PRIMARY KEY (tender_id, tenderer_name, form_key)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tenderers (
+                    tender_id TEXT NOT NULL,
+                    tenderer_name TEXT NOT NULL,
+                    forms_count INTEGER NOT NULL,
+                    completed_at TEXT NOT NULL,
+                    PRIMARY KEY (tender_id, tenderer_name)
+                )
+            """)
+            # Persistent batch queue: one row per tender with its latest status
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tender_queue (
+                    tender_id TEXT PRIMARY KEY,
+                    remark TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    detail TEXT NOT NULL DEFAULT '',
+                    position INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+
+    def mark_form_done(self, tender_id, tenderer_name, form_key, form_name):
+        """Record a submitted form evaluation; `form_key` is the form's row ID, the name is for display"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO form_checkpoints VALUES (?, ?, ?, ?, ?)",
+                (str(tender_id), tenderer_name, form_key, form_name, _now()),
+            )
+
+    def completed_forms(self, tender_id, tenderer_name):
+        """Return the set of form keys (row IDs) already submitted for a tenderer"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT form_key FROM form_checkpoints WHERE tender_id = ? AND tenderer_name = ?",
+                (str(tender_id), tenderer_name),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_tenderer_done(self, tender_id, tenderer_name, forms_count):
+        """Record that every pending form of a tenderer has been handled"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tenderers VALUES (?, ?, ?, ?)",
+                (str(tender_id), tenderer_name, forms_count, _now()),
+            )
+
+    def completed_tenderers(self, tender_id):
+        """Return the set of tenderer names finished in earlier runs"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tenderer_name FROM tenderers WHERE tender_id = ?",
+                (str(tender_id),),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def enqueue_tenders(self, jobs, requeue_done=False):
+        """Add (tender_id, remark) jobs to the batch queue as PENDING.
+
+        Tenders already DONE keep their status unless `requeue_done` is set.
+        """
+        with self._lock, self._conn:
+            position = self._conn.execute("SELECT COALESCE(MAX(position), 0) FROM tender_queue").fetchone()[0]
+            for tender_id, remark in jobs:
+                row = self._conn.execute(
+                    "SELECT status FROM tender_queue WHERE tender_id = ?", (str(tender_id),)
+                ).fetchone()
+                if row and row[0] == "DONE" and not requeue_done:
+                    continue
+                position += 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tender_queue VALUES (?, ?, 'PENDING', '', ?, ?)",
+                    (str(tender_id), remark, position, _now()),
+                )
+
+    def set_tender_status(self, tender_id, status, detail=""):
+        """Update a queued tender's status (PENDING, RUNNING, DONE or FAILED)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE tender_queue SET status = ?, detail = ?, updated_at = ? WHERE tender_id = ?",
+                (status, detail, _now(), str(tender_id)),
+            )
+
+    def tender_queue(self, tender_ids=None):
+        """Return queued tenders in order as dicts, optionally limited to `tender_ids`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tender_id, remark, status, detail, updated_at FROM tender_queue ORDER BY position"
+            ).fetchall()
+        wanted = {str(t) for t in tender_ids} if tender_ids is not None else None
+        return [
+            {"tender_id": r[0], "remark": r[1], "status": r[2], "detail": r[3], "updated_at": r[4]}
+            for r in rows if wanted is None or r[0] in wanted
+        ]
+
+    def clear(self, tender_id):
+        """Forget all progress for a tender"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM form_checkpoints WHERE tender_id = ?", (str(tender_id),))
+            self._conn.execute("DELETE FROM tenderers WHERE tender_id = ?", (str(tender_id),))
+            self._conn.execute("DELETE FROM tender_queue WHERE tender_id = ?", (str(tender_id),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class FreshRunCheckpoint:
+    """View of a CheckpointStore for a run without resume.
+
+    Progress is still recorded in the store, but only forms submitted
+    through this view count as completed, so earlier runs' checkpoints do
+    not cause forms to be skipped.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._forms = {}
+        self._lock = threading.Lock()
+
+    def mark_form_done(self, tender_id, tenderer_name, form_key, form_name):
+        self.store.mark_form_done(tender_id, tenderer_name, form_key, form_name)
+        with self._lock:
+            self._forms.setdefault((str(tender_id), tenderer_name), set()).add(form_key)
+
+    def completed_forms(self, tender_id, tenderer_name):
+        with self._lock:
+            return set(self._forms.get((str(tender_id), tenderer_name), ()))
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
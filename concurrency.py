@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from rate_limit import portal_limiter, LATENCY_TARGET
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Read /proc instead (Linux); elsewhere only load and latency are watched
+
+# Adaptive concurrency: the number of active workers (browsers or tabs) follows free
+# memory, CPU load and portal latency, between 1 and the count asked for.
+MEMORY_RESERVE_MB = float(os.getenv("MEMORY_RESERVE_MB", "300"))
+CPU_LOAD_LIMIT = float(os.getenv("CPU_LOAD_LIMIT", "0.9"))  # 1-minute load average per core
+CONCURRENCY_CHECK_SECONDS = float(os.getenv("CONCURRENCY_CHECK_SECONDS", "5"))
+# Expected extra memory of one more worker, until browsers have been measured
+BROWSER_MEMORY_MB = float(os.getenv("BROWSER_MEMORY_MB", "400"))
+TAB_MEMORY_MB = float(os.getenv("TAB_MEMORY_MB", "150"))
+# A browser whose process tree grows past this is recycled (or, in tab mode, gets fewer tabs)
+BROWSER_MEMORY_CEILING_MB = float(os.getenv("BROWSER_MEMORY_CEILING_MB", "1200"))
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+def available_memory_mb():
+    """Free memory for new browsers, honouring a cgroup (container) limit; None if unknown"""
+    available = None
+    if psutil is not None:
+        available = psutil.virtual_memory().available / 2**20
+    else:
+        try:
+            for line in _read("/proc/meminfo").splitlines():
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    try:
+        limit = _read("/sys/fs/cgroup/memory.max").strip()
+        if limit != "max":
+            headroom = (int(limit) - int(_read("/sys/fs/cgroup/memory.current"))) / 2**20
+            available = headroom if available is None else min(available, headroom)
+    except (OSError, ValueError):
+        pass
+    return available
+
+def cpu_load():
+    """1-minute load average per core, or None where the OS does not report it"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (OSError, AttributeError):
+        return None
+
+def _process_tree_rss_mb(pid):
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / 2**20
+
+    # /proc: map parents to children, then sum resident pages of the whole tree
+    children = {}
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+    for entry in pids:
+        try:
+            stat = _read(f"/proc/{entry}/stat")
+        except OSError:
+            continue
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            total += int(_read(f"/proc/{current}/statm").split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(current, []))
+    return total / 2**20 if total else None
+
+def browser_rss_mb(driver):
+    """Resident memory of the driver's chromedriver + Chrome process tree, or None if unknown"""
+    try:
+        return _process_tree_rss_mb(driver.service.process.pid)
+    except AttributeError:
+        return None
+
+def browser_over_ceiling(driver, ceiling=BROWSER_MEMORY_CEILING_MB):
+    """The browser's memory in MB if it is past `ceiling`, else None"""
+    rss = browser_rss_mb(driver)
+    return rss if rss is not None and rss > ceiling else None
+
+class ConcurrencyController:
+    """How many of a run's `max_workers` workers may be active right now.
+
+    Re-evaluated at most every `check_seconds`: one worker fewer while free
+    memory is below the reserve, CPU load or portal latency is over its limit,
+    or the shared browser (`driver`, tab mode) is past the memory ceiling; one
+    more when there is room for another `worker_mb`. `on_change` gets a
+    message whenever the count changes.
+    """
+
+    def __init__(self, max_workers, worker_mb=BROWSER_MEMORY_MB, driver=None, on_change=None, check_seconds=CONCURRENCY_CHECK_SECONDS):
+        self.max_workers = max_workers
+        self.worker_mb = worker_mb
+        self.driver = driver
+        self.on_change = on_change
+        self.check_seconds = check_seconds
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+        # Start with as many workers as free memory allows
+        memory = available_memory_mb()
+        affordable = max_workers if memory is None else 1 + int(max(0.0, memory - MEMORY_RESERVE_MB) // worker_mb)
+        self.allowed = max(1, min(max_workers, affordable))
+
+    def update(self):
+        """Re-evaluate the worker count if it is due"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked < self.check_seconds:
+                return
+            self._checked = now
+            before = self.allowed
+
+            memory = available_memory_mb()
+            load = cpu_load()
+            latency = portal_limiter.latency
+            browser = browser_over_ceiling(self.driver) if self.driver is not None else None
+            if memory is not None and memory < MEMORY_RESERVE_MB:
+                self.allowed, reason = before - 1, f"{memory:.0f} MB free"
+            elif browser is not None:
+                self.allowed, reason = before - 1, f"browser at {browser:.0f} MB"
+            elif load is not None and load > CPU_LOAD_LIMIT:
+                self.allowed, reason = before - 1, f"load {load:.2f} per core"
+            elif latency is not None and latency > LATENCY_TARGET:
+                self.allowed, reason = before - 1, f"portal responding in {latency:.1f}s"
+            elif memory is None or memory - self.worker_mb >= MEMORY_RESERVE_MB:
+                self.allowed, reason = before + 1, "headroom available"
+            self.allowed = max(1, min(self.max_workers, self.allowed))
+            after = self.allowed
+
+        if after != before and self.on_change:
+            self.on_change(f"{'📈' if after > before else '📉'} ACTIVE WORKERS {before} → {after} ({reason})")
+
+    def admits(self, worker_num):
+        """True if worker `worker_num` (1-based) may take its next task"""
+        self.update()
+        return worker_num <= self.allowed
+
+    def wait_for_turn(self, worker_num, give_up=lambda: False):
+        """Block until worker `worker_num` is admitted; False if `give_up()` turned true first"""
+        while not self.admits(worker_num):
+            if give_up():
+                return False
+            time.sleep(self.check_seconds)
+        return True
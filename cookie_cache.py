@@ -0,0 +1,67 @@
+import base64
+import functools
+import hashlib
+import json
+import os
+import time
+from cryptography.fernet import Fernet, InvalidToken
+
+# Encrypted per-account session cookies, so repeated runs can skip the login form.
+# The key is derived from the account password: a cache file is useless without it,
+# and a changed password simply invalidates the cache.
+COOKIE_CACHE_DIR = os.getenv("COOKIE_CACHE_DIR", ".cookie_cache")
+COOKIE_MAX_AGE = int(os.getenv("COOKIE_MAX_AGE", str(12 * 3600)))
+
+# Fields accepted by CDP Network.setCookies
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+def _cache_path(email):
+    digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+    return os.path.join(COOKIE_CACHE_DIR, f"{digest}.bin")
+
+@functools.lru_cache(maxsize=16)
+def _fernet(email, password):
+    salt = hashlib.sha256(email.strip().lower().encode()).digest()
+    key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 200_000)
+    return Fernet(base64.urlsafe_b64encode(key))
+
+def save_cookies(email, password, cookies):
+    """Encrypt and store an account's session cookies"""
+    os.makedirs(COOKIE_CACHE_DIR, exist_ok=True)
+    payload = json.dumps({"saved_at": time.time(), "cookies": cookies}).encode()
+    with open(_cache_path(email), "wb") as f:
+        f.write(_fernet(email, password).encrypt(payload))
+
+def load_cookies(email, password):
+    """Return an account's cached cookies, or None if missing, stale or undecryptable"""
+    try:
+        with open(_cache_path(email), "rb") as f:
+            token = f.read()
+        data = json.loads(_fernet(email, password).decrypt(token, ttl=COOKIE_MAX_AGE))
+    except (OSError, InvalidToken, ValueError):
+        return None
+    return data["cookies"] or None
+
+def clear_cookies(email):
+    """Forget an account's cached session"""
+    try:
+        os.remove(_cache_path(email))
+    except OSError:
+        pass
+
+def snapshot_cookies(driver, host):
+    """All browser cookies for `host` (including HttpOnly ones), in CDP form"""
+    snapshot = []
+    for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]:
+        domain = cookie["domain"].lstrip(".")
+        if host != domain and not host.endswith("." + domain):
+            continue
+        saved = {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+        if cookie.get("session") or saved.get("expires", 0) <= 0:
+            saved.pop("expires", None)  # Keep session cookies as session cookies
+        snapshot.append(saved)
+    return snapshot
+
+def restore_cookies(driver, cookies):
+    """Install cached cookies without loading a page first"""
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
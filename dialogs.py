@@ -0,0 +1,43 @@
+import json
+
+# JavaScript dialogs (alert/confirm/prompt) are answered in the page itself and
+# their text is kept in sessionStorage, which survives the post-submit reload,
+# so nothing has to wait for a dialog that usually never comes. Native dialogs
+# the override misses are accepted by the driver (unhandledPromptBehavior).
+DIALOG_STORAGE_KEY = "__eprocureDialogs"
+
+DIALOG_CAPTURE_JS = """
+(function () {
+    var key = '%s';
+    function record(kind, message) {
+        try {
+            var seen = JSON.parse(sessionStorage.getItem(key) || '[]');
+            seen.push(kind + ': ' + String(message === undefined ? '' : message));
+            sessionStorage.setItem(key, JSON.stringify(seen));
+        } catch (e) {}
+    }
+    window.alert = function (message) { record('alert', message); };
+    window.confirm = function (message) { record('confirm', message); return true; };
+    window.prompt = function (message, value) { record('prompt', message); return value === undefined ? '' : value; };
+})();
+""" % DIALOG_STORAGE_KEY
+
+DRAIN_DIALOGS_JS = """
+var key = '%s';
+var seen = sessionStorage.getItem(key);
+sessionStorage.removeItem(key);
+return seen;
+""" % DIALOG_STORAGE_KEY
+
+def install_dialog_capture(driver):
+    """Answer dialogs in every document the driver's tab loads from now on, and in the current one"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DIALOG_CAPTURE_JS})
+    driver.execute_script(DIALOG_CAPTURE_JS)
+
+def drain_dialogs(driver):
+    """Return the dialog messages captured since the last call and forget them"""
+    try:
+        seen = driver.execute_script(DRAIN_DIALOGS_JS)
+    except Exception:
+        return []  # e.g. about:blank, which has no sessionStorage
+    return json.loads(seen) if seen else []
@@ -0,0 +1,219 @@
+import atexit
+import functools
+import os
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from reporting import st
+from resource_policy import apply_resource_policy
+from dialogs import install_dialog_capture
+
+# Idle browsers kept warm per process, and jobs served before a browser is recycled
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "1"))
+DRIVER_RECYCLE_AFTER = int(os.getenv("DRIVER_RECYCLE_AFTER", "20"))
+
+# --- Chrome Driver Setup ---
+@functools.lru_cache(maxsize=None)
+def resolve_driver_binaries():
+    """Return (chrome binary or None, chromedriver path); resolved once per process"""
+    # Check if running on Streamlit Cloud (Linux with chromium installed)
+    if os.path.exists("/usr/bin/chromium"):
+        st.info("🌐 Detected Streamlit Cloud environment")
+        return "/usr/bin/chromium", "/usr/bin/chromedriver"
+
+    # Local development - use webdriver-manager (version lookup/download happens only here)
+    st.info("💻 Detected local environment")
+    from webdriver_manager.chrome import ChromeDriverManager
+    return None, ChromeDriverManager().install()
+
+def get_chrome_driver():
+    """Initialize Chrome driver compatible with both local and Streamlit Cloud"""
+    chrome_options = Options()
+
+    # Essential options for Streamlit Cloud
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-features=NetworkService")
+    chrome_options.add_argument("--window-size=1920x1080")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # Safety net for native dialogs the in-page capture misses (see dialogs.py)
+    chrome_options.unhandled_prompt_behavior = "accept"
+
+    binary_location, driver_path = resolve_driver_binaries()
+    if binary_location:
+        chrome_options.binary_location = binary_location
+    service = Service(driver_path)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    apply_resource_policy(driver)
+    install_dialog_capture(driver)
+    return driver
+
+def is_healthy(driver):
+    """True if the browser session still answers commands"""
+    try:
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+# --- Warm Pool ---
+class DriverPool:
+    """Process-level pool of pre-launched headless browsers.
+
+    Browsers are health-checked on acquire, wiped (cookies, extra tabs) on
+    release, and recycled after `recycle_after` jobs to bound Chrome's
+    memory growth. Browsers still launching in a warm-up count towards
+    `size`, and acquire() waits for them rather than launching another.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, recycle_after=DRIVER_RECYCLE_AFTER):
+        self.size = size
+        self.recycle_after = recycle_after
+        self._idle = []
+        self._uses = {}
+        self._warming = 0  # Warm-up launches in flight
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _launch(self):
+        driver = get_chrome_driver()
+        with self._lock:
+            self._uses[driver.session_id] = 0
+        return driver
+
+    def _reserve_warm_up(self):
+        """Claim a slot for one more warm-up launch; False if the pool is already full"""
+        with self._lock:
+            if len(self._idle) + self._warming >= self.size:
+                return False
+            self._warming += 1
+            return True
+
+    def _warm_up_one(self):
+        """Launch a browser into a reserved slot. Returns False if the launch failed"""
+        try:
+            driver = self._launch()
+        except Exception:
+            driver = None  # Surfaced again by acquire() when a job needs a browser
+        with self._changed:
+            self._warming -= 1
+            if driver is not None:
+                self._idle.append(driver)
+            self._changed.notify_all()
+        return driver is not None
+
+    def warm_up(self):
+        """Launch browsers until `size` are idle or launching"""
+        while self._reserve_warm_up():
+            if not self._warm_up_one():
+                return
+
+    def warm_up_in_background(self):
+        # The first slot is claimed before returning, so an acquire() right after waits for it
+        if not self._reserve_warm_up():
+            return
+
+        def launch():
+            if self._warm_up_one():
+                self.warm_up()
+
+        threading.Thread(target=launch, name="driver-pool-warm-up", daemon=True).start()
+
+    def acquire(self):
+        """Return a healthy browser, launching one if none is idle or warming up"""
+        while True:
+            with self._changed:
+                while not self._idle and self._warming:
+                    self._changed.wait()
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                driver = self._launch()
+                break
+            if is_healthy(driver):
+                break
+            # Dead session: drop it and try the next one
+            self._forget(driver)
+            _quit(driver)
+        with self._lock:
+            self._uses[driver.session_id] = self._uses.get(driver.session_id, 0) + 1
+        return driver
+
+    def release(self, driver):
+        """Wipe a browser and return it to the pool, or quit it if it is worn out or dead"""
+        with self._lock:
+            uses = self._uses.get(driver.session_id, 0)
+            full = len(self._idle) + self._warming >= self.size
+        if full:
+            self.discard(driver)
+            return
+        if uses >= self.recycle_after or not self._reset(driver):
+            self.discard(driver)
+            # Replace recycled browsers off the critical path
+            self.warm_up_in_background()
+            return
+        with self._changed:
+            full = len(self._idle) + self._warming >= self.size
+            if not full:
+                self._idle.append(driver)
+                self._changed.notify_all()
+        if full:
+            self.discard(driver)  # Filled by a warm-up while this one was being reset
+
+    def discard(self, driver):
+        """Quit a browser that must not be reused"""
+        self._forget(driver)
+        _quit(driver)
+
+    def _forget(self, driver):
+        with self._lock:
+            self._uses.pop(driver.session_id, None)
+
+    def _reset(self, driver):
+        """Drop the previous job's login and tabs; False if the browser is unusable"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self.discard(driver)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """The process-wide driver pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
+
+def warm_up_driver_pool():
+    """Process initializer: resolve the driver binary and pre-launch idle browsers"""
+    get_driver_pool().warm_up_in_background()
@@ -0,0 +1,86 @@
+# Single-pass table extraction: one execute_script call returns headers, cell
+# text and links for every matching table, instead of one WebDriver round trip
+# per header, row and cell.
+
+# Rows are {"id": ..., "cells": [{"text": ..., "links": [{"text", "href", "element"}]}]};
+# "element" comes back as a WebElement so callers can still click it.
+TABLES_JS = """
+var rowSelector = arguments[1];
+var tables = Array.from(document.querySelectorAll(arguments[0]));
+return tables.map(function (table) {
+    var headers = Array.from(table.querySelectorAll('th')).map(function (th) {
+        return th.innerText.trim();
+    });
+    var rows = Array.from(table.querySelectorAll(rowSelector)).filter(function (tr) {
+        return tr.querySelector('td') !== null;
+    }).map(function (tr) {
+        return {
+            id: tr.id || '',
+            cells: Array.from(tr.children).filter(function (cell) {
+                return cell.tagName === 'TD';
+            }).map(function (td) {
+                return {
+                    text: td.innerText.trim(),
+                    links: Array.from(td.querySelectorAll('a')).map(function (a) {
+                        return {text: a.innerText.trim(), href: a.href, element: a};
+                    })
+                };
+            })
+        };
+    });
+    return {headers: headers, rows: rows};
+});
+"""
+
+def extract_tables(driver, selector="table.tableList_1", row_selector="tr"):
+    """Return every table matching `selector` as plain dicts, in one round trip"""
+    return driver.execute_script(TABLES_JS, selector, row_selector)
+
+def find_table(tables, *headers):
+    """Return the first extracted table whose header row contains all `headers`"""
+    for table in tables:
+        if all(header in table["headers"] for header in headers):
+            return table
+    return None
+
+def extract_tenderers_table(driver):
+    """Return the Clarification tab's 'List of Tenderers' table, or None"""
+    return find_table(extract_tables(driver), "S. No.", "List of Tenderers", "Action")
+
+def extract_form_rows(driver):
+    """Return the tenderer's `fformtr_` form rows"""
+    rows = []
+    for table in extract_tables(driver, row_selector="tr[id*='fformtr_']"):
+        rows.extend(table["rows"])
+    return rows
+
+def cell_text(row, index):
+    """Text of the row's cell at `index`, or '' if the row is short"""
+    return row["cells"][index]["text"] if len(row["cells"]) > index else ""
+
+def cell_link(row, index, label=None):
+    """First link in the row's cell at `index` (optionally whose text contains `label`), or None"""
+    if len(row["cells"]) <= index:
+        return None
+    for link in row["cells"][index]["links"]:
+        if label is None or label in link["text"]:
+            return link
+    return None
+
+def classify_form_rows(form_rows, done_forms=()):
+    """Split form rows into pending (row_id, form_name, 'Evaluate Form' link) and a count of evaluated ones.
+
+    Forms whose row ID is in `done_forms` (checkpointed as submitted) count as evaluated.
+    """
+    pending = []
+    evaluated = 0
+    for form_row in form_rows:
+        action_text = cell_text(form_row, 2)  # Action column
+        name_link = cell_link(form_row, 0)
+        form_name = name_link["text"] if name_link else "FORM"
+
+        if "Evaluate Form" in action_text and form_row["id"] not in done_forms:
+            pending.append((form_row["id"], form_name, cell_link(form_row, 2, "Evaluate Form")))
+        elif "Evaluate Form" in action_text or "Form Evaluated" in action_text:
+            evaluated += 1
+    return pending, evaluated
@@ -0,0 +1,187 @@
+# HTTP fast path for form evaluations: reuses the Selenium session's cookies
+# and replays "Evaluate Form" -> techQualify/evalNonCompRemarks -> btnPost as
+# plain requests, parsing the forms table from the returned HTML.
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+
+REQUEST_TIMEOUT = 30
+
+def session_from_driver(driver, pool_size=10):
+    """Build a pooled requests.Session carrying the browser's cookies and user agent"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"], cookie["value"],
+            domain=cookie.get("domain"), path=cookie.get("path", "/"),
+        )
+    return session
+
+# --- HTML Parsing ---
+class FormsTableParser(HTMLParser):
+    """Collect `fformtr_` rows of the tenderer forms table.
+
+    Each row is {"id": ..., "cells": [{"text": ..., "links": [{"text", "href"}, ...]}, ...]}
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._row = None
+        self._cell = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "tr" and "fformtr_" in (attrs.get("id") or ""):
+            self._row = {"id": attrs["id"], "cells": []}
+        elif self._row is not None and tag == "td":
+            self._cell = {"text": "", "links": []}
+        elif self._cell is not None and tag == "a":
+            self._link = [attrs.get("href") or "", ""]
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._link is not None:
+            self._cell["links"].append({"text": self._link[1].strip(), "href": self._link[0]})
+            self._link = None
+        elif tag == "td" and self._cell is not None:
+            self._cell["text"] = " ".join(self._cell["text"].split())
+            self._row["cells"].append(self._cell)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell["text"] += data
+        if self._link is not None:
+            self._link[1] += data
+
+class EvalFormParser(HTMLParser):
+    """Extract the <form> that contains the btnPost submit button"""
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self._form = None
+        self._textarea = None
+        self._select = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._form = {"action": attrs.get("action") or "", "method": (attrs.get("method") or "get").lower(), "fields": []}
+            self.forms.append(self._form)
+        elif self._form is None:
+            return
+        elif tag == "input":
+            self._form["fields"].append({
+                "tag": "input",
+                "id": attrs.get("id"),
+                "name": attrs.get("name"),
+                "type": (attrs.get("type") or "text").lower(),
+                "value": attrs.get("value") or "",
+                "checked": "checked" in attrs,
+            })
+        elif tag == "textarea":
+            self._textarea = {"tag": "textarea", "id": attrs.get("id"), "name": attrs.get("name"), "type": "textarea", "value": "", "checked": False}
+            self._form["fields"].append(self._textarea)
+        elif tag == "select":
+            self._select = {"tag": "select", "id": attrs.get("id"), "name": attrs.get("name"), "type": "select", "value": None, "checked": False}
+            self._form["fields"].append(self._select)
+        elif tag == "option" and self._select is not None:
+            if self._select["value"] is None or "selected" in attrs:
+                self._select["value"] = attrs.get("value") or ""
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "textarea":
+            self._textarea = None
+        elif tag == "select":
+            self._select = None
+
+    def handle_data(self, data):
+        if self._textarea is not None:
+            self._textarea["value"] += data
+
+def parse_form_rows(html):
+    """Return the forms table rows found in a page"""
+    parser = FormsTableParser()
+    parser.feed(html)
+    return parser.rows
+
+def parse_eval_form(html):
+    """Return the evaluation form (the one holding btnPost), or None"""
+    parser = EvalFormParser()
+    parser.feed(html)
+    for form in parser.forms:
+        if any(field["id"] == "btnPost" for field in form["fields"]):
+            return form
+    return None
+
+def build_eval_payload(form, remark_text):
+    """Serialize the evaluation form as the browser would after accepting and remarking"""
+    fields = form["fields"]
+    accept = next((f for f in fields if f["id"] == "techQualify"), None)
+    remark = next((f for f in fields if f["id"] == "evalNonCompRemarks"), None)
+    if accept is None or remark is None or not accept["name"] or not remark["name"]:
+        raise Exception("Evaluation form fields not found")
+
+    payload = []
+    for field in fields:
+        name = field["name"]
+        if not name:
+            continue
+        if field is remark:
+            payload.append((name, remark_text))
+        elif field["type"] == "radio":
+            # Only the checked member of each group is sent; techQualify wins its group
+            if field is accept or (field["checked"] and name != accept["name"]):
+                payload.append((name, field["value"]))
+        elif field["type"] == "checkbox":
+            if field["checked"]:
+                payload.append((name, field["value"] or "on"))
+        elif field["type"] in ("submit", "button", "image", "reset"):
+            if field["id"] == "btnPost":
+                payload.append((name, field["value"]))
+        elif field["type"] != "file":
+            payload.append((name, field["value"] or ""))
+    return payload
+
+# --- Requests ---
+def fetch_form_rows(session, forms_url):
+    """GET the tenderer forms page and return its rows"""
+    response = session.get(forms_url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return parse_form_rows(response.text)
+
+def submit_evaluation(session, forms_url, eval_href, remark_text):
+    """Open an 'Evaluate Form' link, post the accepted evaluation and return the resulting form rows"""
+    form_url = urljoin(forms_url, eval_href)
+    response = session.get(form_url, timeout=REQUEST_TIMEOUT, headers={"Referer": forms_url})
+    response.raise_for_status()
+
+    form = parse_eval_form(response.text)
+    if form is None:
+        raise Exception("Evaluation form not found")
+
+    action_url = urljoin(response.url, form["action"] or response.url)
+    payload = build_eval_payload(form, remark_text)
+    if form["method"] == "post":
+        result = session.post(action_url, data=payload, timeout=REQUEST_TIMEOUT, headers={"Referer": response.url})
+    else:
+        result = session.get(action_url, params=payload, timeout=REQUEST_TIMEOUT, headers={"Referer": response.url})
+    result.raise_for_status()
+
+    rows = parse_form_rows(result.text)
+    if not rows:
+        # The portal did not redirect back to the table; load it explicitly
+        rows = fetch_form_rows(session, forms_url)
+    return rows
@@ -0,0 +1,313 @@
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+import streamlit
+
+# Shared state between the Streamlit server and background job processes
+JOBS_DB = os.getenv("JOBS_DB", "jobs.db")
+JOB_LOG_DIR = os.getenv("JOB_LOG_DIR", "job_logs")
+# Long-lived worker processes; each keeps its own warm browser pool between jobs
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+
+FINISHED_STATUSES = ("DONE", "FAILED")
+
+LEVEL_COLORS = {"error": "#ff0066", "success": "#00ff88", "warning": "#ffc107", "info": "#00ffff", "subheader": "#00ffff"}
+
+# Worker process pool of this server process and its job futures, for liveness checks
+_executor = None
+_executor_lock = threading.Lock()
+_futures = {}
+
+class JobStore:
+    """SQLite-backed job records, message events and live widget slots"""
+
+    def __init__(self, path=JOBS_DB):
+        # Autocommit; WAL lets the app read while a worker process writes.
+        # Worker-pool threads share the connection, serialized by self._lock.
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                label TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                error TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._execute("""
+            CREATE TABLE IF NOT EXISTS job_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                body TEXT NOT NULL
+            )
+        """)
+        self._execute("""
+            CREATE TABLE IF NOT EXISTS job_slots (
+                job_id TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                body TEXT NOT NULL,
+                PRIMARY KEY (job_id, slot)
+            )
+        """)
+
+    def _execute(self, query, params=()):
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def create_job(self, job_id, label):
+        self._execute(
+            "INSERT INTO jobs (job_id, label, status, created_at, updated_at) VALUES (?, ?, 'QUEUED', ?, ?)",
+            (job_id, label, _now(), _now()),
+        )
+
+    def update_job(self, job_id, **fields):
+        """Set any of status/progress/error on a job"""
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(
+            f"UPDATE jobs SET {columns}, updated_at = ? WHERE job_id = ?",
+            (*fields.values(), _now(), job_id),
+        )
+
+    def get_job(self, job_id):
+        row = self._execute(
+            "SELECT job_id, label, status, progress, error, created_at, updated_at FROM jobs WHERE job_id = ?",
+            (job_id,),
+        )
+        if not row:
+            return None
+        keys = ("job_id", "label", "status", "progress", "error", "created_at", "updated_at")
+        return dict(zip(keys, row[0]))
+
+    def add_event(self, job_id, kind, body):
+        self._execute("INSERT INTO job_events (job_id, kind, body) VALUES (?, ?, ?)", (job_id, kind, body))
+        self._execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (_now(), job_id))
+
+    def events(self, job_id, kinds, limit=None):
+        """Return (kind, body) events of the given kinds, newest first"""
+        marks = ", ".join("?" for _ in kinds)
+        query = f"SELECT kind, body FROM job_events WHERE job_id = ? AND kind IN ({marks}) ORDER BY seq DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self._execute(query, (job_id, *kinds))
+
+    def set_slot(self, job_id, slot, kind, body):
+        self._execute("INSERT OR REPLACE INTO job_slots VALUES (?, ?, ?, ?)", (job_id, slot, kind, body))
+
+    def slots(self, job_id):
+        return self._execute(
+            "SELECT kind, body FROM job_slots WHERE job_id = ? ORDER BY slot", (job_id,)
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# --- Worker-side reporter ---
+class JobSlot:
+    """Stand-in for st.empty()/st.progress() that persists its latest content"""
+
+    def __init__(self, reporter, slot):
+        self._reporter = reporter
+        self._slot = slot
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self._reporter.store.set_slot(self._reporter.job_id, self._slot, "markdown", body)
+
+    def progress(self, value):
+        self._reporter.store.set_slot(self._reporter.job_id, self._slot, "progress", str(value))
+        self._reporter.store.update_job(self._reporter.job_id, progress=float(value))
+
+    def download_button(self, label, data, file_name, mime="text/csv"):
+        if hasattr(data, "read"):
+            path = data.name  # Already a file on disk: serve it in place
+        else:
+            os.makedirs(JOB_LOG_DIR, exist_ok=True)
+            path = os.path.join(JOB_LOG_DIR, f"{self._reporter.job_id}_{file_name}")
+            with open(path, "w" if isinstance(data, str) else "wb") as f:
+                f.write(data)
+        body = json.dumps({"label": label, "file_name": file_name, "path": path, "mime": mime})
+        self._reporter.store.set_slot(self._reporter.job_id, self._slot, "download", body)
+
+class JobReporter:
+    """Implements the subset of the Streamlit API used by the automation modules"""
+
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+        self._slot_ids = itertools.count(1)
+
+    def _message(self, kind, body):
+        self.store.add_event(self.job_id, kind, str(body))
+
+    def info(self, body):
+        self._message("info", body)
+
+    def success(self, body):
+        self._message("success", body)
+
+    def warning(self, body):
+        self._message("warning", body)
+
+    def error(self, body):
+        self._message("error", body)
+
+    def subheader(self, body):
+        self._message("subheader", body)
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self._message("markdown", body)
+
+    def divider(self):
+        pass
+
+    def empty(self):
+        return JobSlot(self, next(self._slot_ids))
+
+    def progress(self, value):
+        slot = self.empty()
+        slot.progress(value)
+        return slot
+
+    @property
+    def sidebar(self):
+        # Sidebar widgets become ordinary slots of the job view
+        return _NullContext()
+
+class _NullContext:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+def _run_job(job_id, kind, params):
+    """Entry point of a background worker process"""
+    from reporting import set_reporter
+
+    store = JobStore()
+    set_reporter(JobReporter(store, job_id))
+    store.update_job(job_id, status="RUNNING")
+    try:
+        if kind == "batch":
+            from batch import run_batch
+            ok = run_batch(**params)
+        else:
+            from automation import run_automation
+            ok = run_automation(**params)
+        store.update_job(job_id, status="DONE" if ok else "FAILED")
+    except Exception as e:
+        store.update_job(job_id, status="FAILED", error=str(e))
+    finally:
+        store.close()
+
+def _warm_up_worker():
+    """Process initializer; imports Selenium in the worker, not in the app server"""
+    from driver_pool import warm_up_driver_pool
+    warm_up_driver_pool()
+
+def _get_executor(broken=None):
+    """The worker process pool, replacing it if it is `broken`"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None and _executor is broken:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_CONCURRENT_JOBS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up_worker,
+            )
+        return _executor
+
+# --- App-side API ---
+def start_job(kind, label, params):
+    """Queue `run_automation` ("single") or `run_batch` ("batch") on a worker process. Returns the job ID"""
+    job_id = uuid.uuid4().hex[:8]
+    store = JobStore()
+    store.create_job(job_id, label)
+    store.close()
+    executor = _get_executor()
+    try:
+        _futures[job_id] = executor.submit(_run_job, job_id, kind, params)
+    except BrokenProcessPool:
+        # A worker died abruptly (e.g. OOM-killed), which leaves the pool unusable for good
+        _futures[job_id] = _get_executor(broken=executor).submit(_run_job, job_id, kind, params)
+    return job_id
+
+def get_job_status(job_id, store):
+    """Return the job record, or None; fails jobs whose worker process is gone"""
+    job = store.get_job(job_id)
+    # A worker that died without reporting (killed, crashed) would otherwise show RUNNING forever
+    future = _futures.get(job_id)
+    if job is not None and job["status"] not in FINISHED_STATUSES and future is not None and future.done():
+        error = future.exception()
+        store.update_job(job_id, status="FAILED", error=f"Worker exited: {error}")
+        job = store.get_job(job_id)
+    return job
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def render_job(job_id, store):
+    """Render a job's progress, live widgets and latest messages. Returns the job record, or None.
+
+    Download buttons are only shown once the job has finished; their files
+    are read when clicked, not on every render.
+    """
+    job = get_job_status(job_id, store)
+    if job is None:
+        streamlit.warning(f"⚠️ JOB {job_id} NOT FOUND")
+        return None
+
+    color = LEVEL_COLORS["success"] if job["status"] == "DONE" else LEVEL_COLORS["error"] if job["status"] == "FAILED" else LEVEL_COLORS["info"]
+    streamlit.markdown(
+        f"<h4 style='color: {color};'>🛰️ JOB {job_id} · {job['label']} · {job['status']}</h4>",
+        unsafe_allow_html=True,
+    )
+    streamlit.progress(min(max(job["progress"], 0.0), 1.0))
+    if job["error"]:
+        streamlit.error(f"❌ {job['error']}")
+
+    for slot_num, (kind, body) in enumerate(store.slots(job_id)):
+        if kind == "markdown" and body:
+            streamlit.markdown(body, unsafe_allow_html=True)
+        elif kind == "download" and job["status"] in FINISHED_STATUSES:
+            download = json.loads(body)
+            if os.path.exists(download["path"]):
+                streamlit.download_button(
+                    label=download["label"], data=functools.partial(_read_file, download["path"]),
+                    file_name=download["file_name"], mime=download["mime"],
+                    key=f"download_{job_id}_{slot_num}", on_click="ignore",
+                )
+
+    messages = store.events(job_id, ("info", "success", "warning", "error", "subheader"), limit=30)
+    log_html = "".join(
+        f"<p style='color: {LEVEL_COLORS[kind]}; font-size: 14px; margin: 2px 0;'>{body}</p>"
+        for kind, body in messages
+    )
+    if log_html:
+        streamlit.markdown(log_html, unsafe_allow_html=True)
+
+    # Execution summaries and reports, oldest first
+    for _, body in reversed(store.events(job_id, ("markdown",))):
+        streamlit.markdown(body, unsafe_allow_html=True)
+    return job
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,280 @@
+# Configurable mock of the eprocure pages the automation touches, for offline
+# benchmarks (see benchmark.py). Unlike stub_server.py it needs no recordings:
+# tenders, tenderers and forms are generated, evaluations are kept in memory and
+# every response can be delayed to imitate the live portal's latency.
+#
+# Usage: python mock_portal.py --tenderers 5 --forms 8 --latency-ms 150
+import argparse
+import html
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+SESSION_COOKIE = "JSESSIONID"
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>e-GP Mock</title></head>
+<body>
+{header}
+{body}
+</body></html>"""
+
+HEADER = """<div id="header"><ul>
+<li id="headTabTender"><a href="#">Tender</a>
+<ul><li><a href="/officer/MyTenders.jsp">My Tenders</a></li></ul></li>
+</ul></div>"""
+
+LOGIN_BODY = """<form method="post" action="/Login.jsp">
+<input type="text" id="txtEmailId" name="emailId">
+<input type="password" id="txtPassword" name="password">
+<input type="submit" id="btnLogin" value="Login">
+</form>"""
+
+UPDATE_PROMPT_BODY = """<p>Please update your profile.</p>
+<a id="btnUpdateLater" href="/officer/MyTenders.jsp">Update Later</a>"""
+
+MY_TENDERS_BODY = """<input type="text" id="tenderId">
+<a id="processingTab" href="#" onclick="showProcessing(); return false;">Processing</a>
+<div id="grid"></div>
+<script>
+var TENDERS = {tender_ids};
+function showProcessing() {{
+    var id = document.getElementById('tenderId').value.trim();
+    document.getElementById('grid').innerHTML = TENDERS.indexOf(id) === -1 ? 'No records found' :
+        '<a href="/officer/TenderDashboard.jsp?tenderid=' + id + '">Dashboard</a>';
+}}
+</script>"""
+
+EVAL_COMM_BODY = """<a id="tbClari" href="#" onclick="showClarification(); return false;">Clarification</a>
+<div id="clarification"></div>
+<template id="clarificationTpl">
+<table class="tableList_1">
+<tr><th>S. No.</th><th>List of Tenderers</th><th>Status</th><th>Action</th></tr>
+{rows}
+</table>
+</template>
+<script>
+function showClarification() {{
+    document.getElementById('clarification').innerHTML = document.getElementById('clarificationTpl').innerHTML;
+}}
+</script>"""
+
+FORMS_BODY = """<h3>{tenderer}</h3>
+<table class="tableList_1">
+<tr><th>Form Name</th><th>Type</th><th>Action</th></tr>
+{rows}
+</table>"""
+
+EVAL_FORM_BODY = """<form method="post" action="/officer/EvalFormPage.jsp">
+<input type="hidden" name="tenderid" value="{tender_id}">
+<input type="hidden" name="uid" value="{uid}">
+<input type="hidden" name="formId" value="{form_id}">
+<input type="radio" id="techQualify" name="techQualify" value="Qualified">
+<input type="radio" id="techDisqualify" name="techQualify" value="Disqualified">
+<textarea id="evalNonCompRemarks" name="evalNonCompRemarks"></textarea>
+<input type="submit" id="btnPost" name="btnPost" value="Post"{confirm}>
+</form>"""
+
+class MockPortal(ThreadingHTTPServer):
+    """Generated tenders with `tenderers` tenderers of `forms` forms each.
+
+    `evaluated` holds (tender_id, uid, form_id) of every accepted submission.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, tenders=1, tenderers=5, forms=8, latency_ms=0, jitter_ms=0,
+                 update_prompt=False, confirm_dialog=False, address=("127.0.0.1", 0)):
+        super().__init__(address, MockHandler)
+        self.tender_ids = [str(100001 + i) for i in range(tenders)]
+        self.tenderers = tenderers
+        self.forms = forms
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.update_prompt = update_prompt
+        self.confirm_dialog = confirm_dialog
+        self.sessions = set()
+        self.evaluated = set()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_in_background(self):
+        threading.Thread(target=self.serve_forever, name="mock-portal", daemon=True).start()
+        return self
+
+    @property
+    def total_forms(self):
+        return len(self.tender_ids) * self.tenderers * self.forms
+
+    def completed_tenderers(self):
+        """Number of tenderers whose forms are all evaluated"""
+        with self._lock:
+            evaluated = set(self.evaluated)
+        return sum(
+            all((tender_id, uid, form_id) in evaluated for form_id in range(1, self.forms + 1))
+            for tender_id in self.tender_ids
+            for uid in range(1, self.tenderers + 1)
+        )
+
+    def is_evaluated(self, tender_id, uid, form_id):
+        with self._lock:
+            return (tender_id, uid, form_id) in self.evaluated
+
+class MockHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._delay()
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path in ("/", "/Index.jsp"):
+            self._page(LOGIN_BODY, header=False)
+        elif not self._logged_in():
+            # Expired or missing session: the portal shows the login form again
+            self._page(LOGIN_BODY, header=False)
+        elif url.path == "/UpdatePrompt.jsp":
+            self._page(UPDATE_PROMPT_BODY)
+        elif url.path == "/officer/MyTenders.jsp":
+            self._page(MY_TENDERS_BODY.format(tender_ids=json.dumps(self.server.tender_ids)))
+        elif url.path == "/officer/TenderDashboard.jsp" and self._tender(query):
+            tender_id = query["tenderid"]
+            self._page(f'<a href="/officer/EvalComm.jsp?tenderid={tender_id}&amp;comType=TEC">Evaluation Committee</a>')
+        elif url.path == "/officer/EvalComm.jsp" and self._tender(query):
+            self._page(self._eval_comm(query["tenderid"]))
+        elif url.path == "/officer/EvalTenderer.jsp" and self._tenderer(query):
+            self._page(self._forms(query["tenderid"], int(query["uid"])))
+        elif url.path == "/officer/EvalFormPage.jsp" and self._form(query):
+            confirm = " onclick=\"return confirm('Are you sure you want to post?');\"" if self.server.confirm_dialog else ""
+            self._page(EVAL_FORM_BODY.format(tender_id=query["tenderid"], uid=query["uid"], form_id=query["formId"], confirm=confirm))
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        self._delay()
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8", "replace")).items()}
+        path = urlsplit(self.path).path
+
+        if path == "/Login.jsp":
+            if not fields.get("emailId") or not fields.get("password"):
+                self._page(LOGIN_BODY, header=False)
+                return
+            token = secrets.token_hex(16)
+            with self.server._lock:
+                self.server.sessions.add(token)
+            target = "/UpdatePrompt.jsp" if self.server.update_prompt else "/officer/MyTenders.jsp"
+            self._redirect(target, cookie=f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")
+        elif path == "/officer/EvalFormPage.jsp":
+            if not self._logged_in():
+                self._page(LOGIN_BODY, header=False)
+                return
+            if not self._form(fields) or fields.get("techQualify") != "Qualified" or not fields.get("evalNonCompRemarks"):
+                self.send_error(400, "Incomplete evaluation")
+                return
+            key = (fields["tenderid"], int(fields["uid"]), int(fields["formId"]))
+            with self.server._lock:
+                self.server.evaluated.add(key)
+            self._redirect(f"/officer/EvalTenderer.jsp?tenderid={key[0]}&uid={key[1]}")
+        else:
+            self.send_error(404)
+
+    # --- Pages ---
+    def _eval_comm(self, tender_id):
+        rows = []
+        for uid in range(1, self.server.tenderers + 1):
+            done = all(self.server.is_evaluated(tender_id, uid, form_id) for form_id in range(1, self.server.forms + 1))
+            label = "Edit" if done else "Evaluate Tenderer"
+            rows.append(
+                f"<tr><td>{uid}</td><td>{html.escape(tenderer_name(uid))}</td><td>{'Evaluated' if done else 'Pending'}</td>"
+                f"<td><a href=\"/officer/EvalTenderer.jsp?tenderid={tender_id}&amp;uid={uid}\">{label}</a></td></tr>"
+            )
+        return EVAL_COMM_BODY.format(rows="\n".join(rows))
+
+    def _forms(self, tender_id, uid):
+        rows = []
+        for form_id in range(1, self.server.forms + 1):
+            if self.server.is_evaluated(tender_id, uid, form_id):
+                action = "Form Evaluated"
+            else:
+                action = f"<a href=\"/officer/EvalFormPage.jsp?tenderid={tender_id}&amp;uid={uid}&amp;formId={form_id}\">Evaluate Form</a>"
+            rows.append(
+                f"<tr id=\"fformtr_{form_id}\"><td><a href=\"/officer/ViewForm.jsp?formId={form_id}\">Form {form_id}: Technical Specification</a></td>"
+                f"<td>Technical</td><td>{action}</td></tr>"
+            )
+        return FORMS_BODY.format(tenderer=html.escape(tenderer_name(uid)), rows="\n".join(rows))
+
+    # --- Helpers ---
+    def _tender(self, query):
+        return query.get("tenderid") in self.server.tender_ids
+
+    def _tenderer(self, query):
+        return self._tender(query) and query.get("uid", "").isdigit() and 1 <= int(query["uid"]) <= self.server.tenderers
+
+    def _form(self, query):
+        return self._tenderer(query) and query.get("formId", "").isdigit() and 1 <= int(query["formId"]) <= self.server.forms
+
+    def _logged_in(self):
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE:
+                with self.server._lock:
+                    return value in self.server.sessions
+        return False
+
+    def _delay(self):
+        with self.server._lock:
+            self.server.requests += 1
+        delay_ms = self.server.latency_ms + random.uniform(-1, 1) * self.server.jitter_ms
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _page(self, body, header=True):
+        data = PAGE.format(header=HEADER if header else "", body=body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, cookie=None):
+        self.send_response(302)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def tenderer_name(uid):
+    return f"Mock Tenderer {uid:03d} Ltd."
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a mock eprocure portal locally")
+    parser.add_argument("--tenders", type=int, default=1)
+    parser.add_argument("--tenderers", type=int, default=5)
+    parser.add_argument("--forms", type=int, default=8, help="forms per tenderer")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--update-prompt", action="store_true", help="show the 'update later' page after login")
+    parser.add_argument("--confirm-dialog", action="store_true", help="ask for confirmation when posting a form")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = MockPortal(args.tenders, args.tenderers, args.forms, args.latency_ms, args.jitter_ms,
+                        args.update_prompt, args.confirm_dialog, (args.host, args.port))
+    print(f"Mock portal with tenders {', '.join(server.tender_ids)} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,109 @@
+from collections import deque
+from datetime import datetime
+from retry import TransientError, is_transient, backoff_delay, portal_throttle, RETRY_ATTEMPTS
+
+# Outcome handling shared by the browser engine (automation.py) and the tab
+# engine (cdp_engine.py): per-form retry and failure accounting, and the
+# ("start" | "log" | "result" | "failed", payload) events of each tenderer.
+
+def _timestamp():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+class FormQueue:
+    """One tenderer's pending forms, with transient failures re-queued behind the rest.
+
+    Entries are (row_id, form_name, link, attempt) tuples. `submitted` and
+    `failed` record an attempt in the run log, the error-rate throttle and the
+    checkpoint; `finish` raises if any form was given up.
+    """
+
+    def __init__(self, pending, tenderer_name, run_log, checkpoint=None, tender_id=None):
+        self.tenderer_name = tenderer_name
+        self.run_log = run_log
+        self.checkpoint = checkpoint
+        self.tender_id = tender_id
+        self.processed = 0
+        self.failures = 0
+        self.permanent_failures = 0
+        self._pending = deque((row_id, form_name, link, 0) for row_id, form_name, link in pending)
+
+    def __bool__(self):
+        return bool(self._pending)
+
+    def pop(self):
+        return self._pending.popleft()
+
+    def submitted(self, entry, confirmed_after=None):
+        """Count and checkpoint a form; `confirmed_after` is the error its post went through despite"""
+        row_id, form_name, _, _ = entry
+        portal_throttle.record(True)
+        self.processed += 1
+        if self.checkpoint:
+            self.checkpoint.mark_form_done(self.tender_id, self.tenderer_name, row_id, form_name)
+        note = f" (confirmed after {type(confirmed_after).__name__})" if confirmed_after else ""
+        self.run_log.detail(f"✅ {self.tenderer_name} - FORM #{self.processed} SUBMITTED: {form_name}{note}")
+
+    def failed(self, entry, error):
+        """Record a failed attempt. Returns the back-off delay if the form was re-queued, else None"""
+        row_id, form_name, link, attempt = entry
+        portal_throttle.record(False)
+        self.run_log.detail(f"❌ {self.tenderer_name} - FORM {form_name} (attempt {attempt + 1}): {error}")
+        if is_transient(error) and attempt + 1 < RETRY_ATTEMPTS:
+            delay = backoff_delay(attempt)
+            self.run_log.add(f"🔁 RETRYING {form_name[:40]} IN {delay:.1f}s ({type(error).__name__})")
+            self._pending.append((row_id, form_name, link, attempt + 1))
+            return delay
+        self.failures += 1
+        self.permanent_failures += not is_transient(error)
+        self.run_log.add(f"❌ ERROR EVALUATING {form_name[:40]}: {str(error)[:80]}")
+        return None
+
+    def finish(self, forms_skipped):
+        """Checkpoint the tenderer and return the forms submitted.
+
+        Raises if any form failed, TransientError if all of those failures were transient.
+        """
+        if self.failures:
+            error = TransientError if not self.permanent_failures else Exception
+            raise error(f"{self.failures} forms failed ({self.processed} submitted)")
+        if self.checkpoint:
+            self.checkpoint.mark_tenderer_done(self.tender_id, self.tenderer_name, self.processed)
+        if self.processed:
+            self.run_log.detail(f"✅ COMPLETED {self.tenderer_name}: {self.processed} forms processed, {forms_skipped} already evaluated")
+        else:
+            self.run_log.detail(f"ℹ️ {self.tenderer_name}: All {forms_skipped} forms already evaluated")
+        return self.processed
+
+def tenderer_started(tenderer, total_tenderers):
+    """Events reporting that a tenderer's evaluation begins"""
+    tenderer_num, tenderer_name, _, _ = tenderer
+    return [
+        ("start", (tenderer_num, tenderer_name)),
+        ("log", f"⚡ PROCESSING #{tenderer_num}/{total_tenderers}: {tenderer_name[:50]}"),
+    ]
+
+def tenderer_succeeded(tenderer, forms_count):
+    """Events reporting a tenderer whose forms all went through"""
+    tenderer_num, tenderer_name, _, _ = tenderer
+    return [
+        ("log", f"✅ COMPLETED: {tenderer_name[:50]} ({forms_count} forms)"),
+        ("result", [_timestamp(), tenderer_num, tenderer_name, "SUCCESS", forms_count, ""]),
+    ]
+
+def tenderer_failed(tenderer, error):
+    """Events reporting a failed tenderer; transient failures are offered to the end-of-run retry"""
+    tenderer_num, tenderer_name, _, _ = tenderer
+    portal_throttle.record(False)
+    return [
+        ("log", f"❌ FAILED: {tenderer_name[:50]} - {str(error)[:30]}"),
+        ("failed", (tenderer, is_transient(error))),
+        ("result", [_timestamp(), tenderer_num, tenderer_name, "FAILED", 0, str(error)]),
+    ]
+
+def tenderer_unreached(tenderer, reason):
+    """Events for a tenderer no worker got to; it goes to the end-of-run retry"""
+    tenderer_num, tenderer_name, _, _ = tenderer
+    return [
+        ("failed", (tenderer, True)),
+        ("result", [_timestamp(), tenderer_num, tenderer_name, "FAILED", 0, reason]),
+    ]
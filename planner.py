@@ -0,0 +1,114 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from extract import classify_form_rows
+from http_engine import session_from_driver, fetch_form_rows
+from rate_limit import portal_limiter
+from reporting import st
+
+# Pre-flight scan: read-only GETs of every tenderer's forms page over the
+# browser's session, used to skip finished tenderers and schedule the rest.
+SCAN_CONCURRENCY = int(os.getenv("SCAN_CONCURRENCY", "4"))
+# Runtime estimate used until the run has measured its own per-form and per-tenderer times
+PLAN_SECONDS_PER_FORM = float(os.getenv("PLAN_SECONDS_PER_FORM", "8"))
+PLAN_SECONDS_PER_FORM_FAST = float(os.getenv("PLAN_SECONDS_PER_FORM_FAST", "2"))
+PLAN_SECONDS_PER_TENDERER = float(os.getenv("PLAN_SECONDS_PER_TENDERER", "5"))
+
+BROWSER_FORM_STEPS = ("forms: open form", "forms: fill form", "forms: submit", "forms: reload table")
+SCRIPTED_FORM_STEPS = ("forms: open form", "forms: fill and submit", "forms: reload table")
+TAB_FORM_STEPS = ("forms: open form", "forms: fill and submit")
+FAST_FORM_STEPS = ("http: submit form",)
+TENDERER_STEPS = ("tenderer: open evaluation", "forms: table load")
+
+def scan_tenderers(driver, tenderer_info, timings, checkpoint=None, tender_id=None):
+    """Count pending and evaluated forms per tenderer without clicking anything.
+
+    Returns the work plan: one {"tenderer", "pending", "evaluated"} dict per
+    tenderer, with None counts where the forms page could not be read (no
+    direct URL, request failed, or no form rows came back).
+    """
+    session = session_from_driver(driver, pool_size=SCAN_CONCURRENCY)
+
+    def scan(tenderer):
+        _, tenderer_name, _, href = tenderer
+        entry = {"tenderer": tenderer, "pending": None, "evaluated": None}
+        if not href:
+            return entry
+        done_forms = checkpoint.completed_forms(tender_id, tenderer_name) if checkpoint else set()
+        try:
+            with timings.step("scan: forms table", tenderer=tenderer_name), portal_limiter.paced(driver):
+                rows = fetch_form_rows(session, href)
+        except Exception:
+            return entry
+        if rows:
+            pending, evaluated = classify_form_rows(rows, done_forms)
+            entry["pending"], entry["evaluated"] = len(pending), evaluated
+        return entry
+
+    with ThreadPoolExecutor(max_workers=SCAN_CONCURRENCY) as executor:
+        return list(executor.map(scan, tenderer_info))
+
+def order_work_plan(plan):
+    """Return (tenderers to run, largest first, and tenderers with nothing pending).
+
+    Unscanned tenderers are run first since their size is unknown.
+    """
+    idle = [entry["tenderer"] for entry in plan if entry["pending"] == 0]
+    work = [entry for entry in plan if entry["pending"] != 0]
+    work.sort(key=lambda entry: float("inf") if entry["pending"] is None else entry["pending"], reverse=True)
+    return [entry["tenderer"] for entry in work], idle
+
+def _measured(timings, steps):
+    """Sum of the average durations of `steps`, or None if any has no samples yet"""
+    averages = {name: avg for name, _, _, avg, *_ in timings.summary()}
+    if not all(step in averages for step in steps):
+        return None
+    return sum(averages[step] for step in steps)
+
+def estimate_runtime(plan, workers, fast_path, timings):
+    """Estimated seconds to run the plan, from this run's timings where available"""
+    if fast_path:
+        per_form = _measured(timings, FAST_FORM_STEPS)
+    else:
+        per_form = (_measured(timings, SCRIPTED_FORM_STEPS) or _measured(timings, BROWSER_FORM_STEPS)
+                    or _measured(timings, TAB_FORM_STEPS))
+    if per_form is None:
+        per_form = PLAN_SECONDS_PER_FORM_FAST if fast_path else PLAN_SECONDS_PER_FORM
+    per_tenderer = _measured(timings, TENDERER_STEPS) or PLAN_SECONDS_PER_TENDERER
+
+    known = [entry["pending"] for entry in plan if entry["pending"] is not None]
+    unknown_size = sum(known) / len(known) if known else 0
+    work = [entry for entry in plan if entry["pending"] != 0]
+    forms = sum(unknown_size if entry["pending"] is None else entry["pending"] for entry in work)
+    total = forms * per_form + len(work) * per_tenderer
+    return total / max(1, min(workers, len(work)))
+
+def render_work_plan(plan, estimate_seconds, limit=20):
+    """Show the scan totals, the runtime estimate and the largest tenderers"""
+    work, idle = order_work_plan(plan)
+    pending = sum(entry["pending"] or 0 for entry in plan)
+    evaluated = sum(entry["evaluated"] or 0 for entry in plan)
+    unscanned = sum(entry["pending"] is None for entry in plan)
+    sizes = {entry["tenderer"][0]: entry for entry in plan}
+
+    table_rows = "".join(
+        f"<tr><td>{num}</td><td>{name[:50]}</td>"
+        f"<td>{'?' if sizes[num]['pending'] is None else sizes[num]['pending']}</td>"
+        f"<td>{'?' if sizes[num]['evaluated'] is None else sizes[num]['evaluated']}</td></tr>"
+        for num, name, _, _ in work[:limit]
+    )
+    minutes, seconds = divmod(int(estimate_seconds), 60)
+    st.markdown(f"""
+    <div class="main-container">
+    <h3 style="text-align: center;">🛰️ PRE-FLIGHT WORK PLAN</h3>
+    <p style="text-align: center; font-size: 18px;">
+    <strong>TENDERERS TO RUN:</strong> {len(work)}<br>
+    <strong style="color: #ffc107;">NOTHING PENDING:</strong> {len(idle)}<br>
+    <strong>FORMS PENDING:</strong> {pending} · <strong>ALREADY EVALUATED:</strong> {evaluated}{f" · <strong>UNSCANNED TENDERERS:</strong> {unscanned}" if unscanned else ""}<br>
+    <strong style="color: #00ff88;">ESTIMATED RUNTIME:</strong> {minutes}m {seconds:02d}s
+    </p>
+    <table style="width: 100%; color: #00ffff;">
+    <tr><th>#</th><th>TENDERER</th><th>PENDING</th><th>EVALUATED</th></tr>
+    {table_rows}
+    </table>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Portal operations (page loads, navigating clicks, form posts) allowed per second.
+# The global bucket is shared by every worker, account and job process of this host;
+# each account additionally has its own bucket, likewise shared across job processes.
+RATE_LIMIT_GLOBAL = float(os.getenv("RATE_LIMIT_GLOBAL", "4"))
+RATE_LIMIT_ACCOUNT = float(os.getenv("RATE_LIMIT_ACCOUNT", "2"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "4"))
+# Smoothed response time above which both rates are scaled down; below it they recover
+LATENCY_TARGET = float(os.getenv("LATENCY_TARGET", "3"))
+MIN_RATE_SCALE = 0.1
+# Bucket state lives here so that jobs running in separate worker processes draw from the same budget
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", os.getenv("JOBS_DB", "jobs.db"))
+
+class TokenBucket:
+    """Token bucket that hands out reservations, so concurrent callers queue fairly"""
+
+    def __init__(self, rate, burst=RATE_LIMIT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost=1, scale=1.0):
+        """Take `cost` tokens and return how long the caller must wait before using them"""
+        rate = self.rate * scale
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= cost
+            return max(0.0, -self._tokens / rate)
+
+class SharedTokenBucket:
+    """TokenBucket whose state is a row in a SQLite table, updated in a transaction per reservation"""
+
+    def __init__(self, name, rate, burst=RATE_LIMIT_BURST, path=RATE_LIMIT_DB):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        # Autocommit mode, so the explicit BEGIN IMMEDIATE below controls the transaction
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+    def reserve(self, cost=1, scale=1.0):
+        """Take `cost` tokens and return how long the caller must wait before using them"""
+        rate = self.rate * scale
+        with self._lock:
+            # Wall-clock time: the row is shared with other processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute("SELECT tokens, updated FROM rate_buckets WHERE name = ?", (self.name,)).fetchone()
+                tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * rate)
+                tokens -= cost
+                self._conn.execute("INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?)", (self.name, tokens, now))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return max(0.0, -tokens / rate)
+
+class PortalRateLimiter:
+    """Global and per-account pacing of portal operations, adapting to response latency.
+
+    Latency is tracked as a moving average of paced operations; while it is
+    above `latency_target` the rates shrink multiplicatively, and they grow
+    back gradually (up to the configured limits) once the portal is fast again.
+    With a `path`, the buckets are SharedTokenBucket rows in that database;
+    without one they only pace this process.
+    """
+
+    def __init__(self, global_rate=RATE_LIMIT_GLOBAL, account_rate=RATE_LIMIT_ACCOUNT, latency_target=LATENCY_TARGET, path=RATE_LIMIT_DB):
+        self.account_rate = account_rate
+        self.latency_target = latency_target
+        self.path = path
+        self.scale = 1.0
+        self.latency = None
+        self._global = None
+        self._global_rate = global_rate
+        self._accounts = {}
+        self._drivers = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, name, rate):
+        return SharedTokenBucket(name, rate, path=self.path) if self.path else TokenBucket(rate)
+
+    def bind(self, driver, account):
+        """Charge the driver's future operations to `account`"""
+        # Accounts are stored hashed; the shared table should not hold e-mail addresses
+        key = "account:" + hashlib.sha256(account.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            self._drivers[driver.session_id] = key
+            if key not in self._accounts:
+                self._accounts[key] = self._bucket(key, self.account_rate)
+
+    def acquire(self, driver=None, cost=1):
+        """Block until the global and the driver's account budget allow an operation"""
+        with self._lock:
+            if self._global is None:
+                # Created on first use: importing this module must not touch the database
+                self._global = self._bucket("global", self._global_rate)
+            scale = self.scale
+            account = self._accounts.get(self._drivers.get(driver.session_id)) if driver is not None else None
+        wait = self._global.reserve(cost, scale)
+        if account is not None:
+            wait = max(wait, account.reserve(cost, scale))
+        if wait:
+            time.sleep(wait)
+
+    def observe(self, seconds):
+        """Feed back one operation's response time"""
+        with self._lock:
+            self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+            if self.latency > self.latency_target:
+                self.scale = max(MIN_RATE_SCALE, self.scale * 0.8)
+            else:
+                self.scale = min(1.0, self.scale + 0.05)
+
+    @contextmanager
+    def paced(self, driver=None, cost=1):
+        """Acquire before the enclosed operation and observe how long it took"""
+        self.acquire(driver, cost)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+portal_limiter = PortalRateLimiter()
@@ -0,0 +1,70 @@
+# UI target for the automation modules: Streamlit itself inside the app, a
+# job reporter inside a background worker process (see jobs.py), or the
+# console for command-line runs (see benchmark.py).
+import contextlib
+import streamlit
+
+class _UiProxy:
+    """Forwards attribute access to the current UI target"""
+
+    def __init__(self):
+        self._target = streamlit
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+st = _UiProxy()
+
+def set_reporter(reporter):
+    """Route every automation UI call made in this process to `reporter`"""
+    st._target = reporter
+
+class _ConsoleSlot:
+    """Placeholder whose live updates (progress, status lines, downloads) are dropped"""
+
+    def markdown(self, body, unsafe_allow_html=False):
+        pass
+
+    def progress(self, value):
+        pass
+
+    def download_button(self, label, data, file_name, mime="text/csv"):
+        pass
+
+class ConsoleReporter:
+    """Prints automation messages to stdout; HTML reports and widgets are skipped"""
+
+    def __init__(self, verbose=True):
+        self.verbose = verbose
+        self.sidebar = contextlib.nullcontext()
+
+    def _print(self, level, body):
+        if self.verbose or level in ("warning", "error"):
+            print(f"[{level}] {body}", flush=True)
+
+    def info(self, body):
+        self._print("info", body)
+
+    def success(self, body):
+        self._print("success", body)
+
+    def warning(self, body):
+        self._print("warning", body)
+
+    def error(self, body):
+        self._print("error", body)
+
+    def subheader(self, body):
+        self._print("info", body)
+
+    def markdown(self, body, unsafe_allow_html=False):
+        pass
+
+    def divider(self):
+        pass
+
+    def empty(self):
+        return _ConsoleSlot()
+
+    def progress(self, value):
+        return _ConsoleSlot()
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from reporting import st
+
+# The evaluation pages only need their HTML and first-party scripts. Everything
+# else is blocked in the browser via DevTools (Network.setBlockedURLs).
+RESOURCE_BLOCKING = os.getenv("RESOURCE_BLOCKING", "1") != "0"
+BLOCKED_RESOURCES = os.getenv("BLOCKED_RESOURCES", "images,fonts,media,stylesheets,trackers")
+# Comma-separated patterns to keep loading, e.g. "*.css" if a form turns out to need its stylesheet
+RESOURCE_ALLOWLIST = os.getenv("RESOURCE_ALLOWLIST", "")
+# Per-page averages from the last run without blocking, to report what blocking saves
+RESOURCE_BASELINE = os.getenv("RESOURCE_BASELINE", "resource_baseline.json")
+
+RESOURCE_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.bmp", "*.ico", "*.svg", "*.webp"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.swf"],
+    "stylesheets": ["*.css"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*addthis.com*", "*sharethis.com*",
+    ],
+}
+
+def blocked_url_patterns():
+    """URL patterns for the enabled resource categories, minus the allow-list"""
+    allowed = {pattern.strip() for pattern in RESOURCE_ALLOWLIST.split(",") if pattern.strip()}
+    patterns = []
+    for category in BLOCKED_RESOURCES.split(","):
+        for pattern in RESOURCE_PATTERNS.get(category.strip(), []):
+            if pattern not in allowed:
+                patterns.append(pattern)
+    return patterns
+
+def apply_resource_policy(driver):
+    """Block non-essential resources for every page loaded in the driver's tab"""
+    if not RESOURCE_BLOCKING:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+
+# --- Page load accounting ---
+# Navigation and resource timing of the current document. transferSize is 0 for
+# cache hits and for cross-origin resources without Timing-Allow-Origin.
+PAGE_STATS_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return null;
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize;
+resources.forEach(function (entry) { bytes += entry.transferSize; });
+return {
+    origin: performance.timeOrigin,
+    bytes: bytes,
+    requests: resources.length + 1,
+    load_ms: (nav.loadEventEnd || nav.domComplete) - nav.startTime
+};
+"""
+
+class PageLoadStats:
+    """Bytes transferred and load time of every page the automation waited on"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._seen = set()
+            self.pages = 0
+            self.bytes = 0
+            self.requests = 0
+            self.load_ms = 0.0
+
+    def sample(self, driver):
+        """Record the current document once; never fails the caller"""
+        try:
+            stats = driver.execute_script(PAGE_STATS_JS)
+        except Exception:
+            return
+        if not stats:
+            return
+        key = (driver.session_id, stats["origin"])
+        with self._lock:
+            if key in self._seen:
+                return
+            self._seen.add(key)
+            self.pages += 1
+            self.bytes += stats["bytes"]
+            self.requests += stats["requests"]
+            self.load_ms += stats["load_ms"]
+
+    def per_page(self):
+        """(KB, requests, load ms) averaged per page, or None before any page was sampled"""
+        with self._lock:
+            if not self.pages:
+                return None
+            return self.bytes / 1024 / self.pages, self.requests / self.pages, self.load_ms / self.pages
+
+page_loads = PageLoadStats()
+
+def _load_baseline():
+    try:
+        with open(RESOURCE_BASELINE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def render_resource_report():
+    """Show per-page bandwidth and load time, and the saving against the unblocked baseline"""
+    averages = page_loads.per_page()
+    if averages is None:
+        return
+    kb, requests, load_ms = averages
+    pages = page_loads.pages
+
+    if not RESOURCE_BLOCKING:
+        # This run is the baseline for later runs with blocking enabled
+        with open(RESOURCE_BASELINE, "w") as f:
+            json.dump({"kb": kb, "requests": requests, "load_ms": load_ms}, f)
+        saving = "<br>Resource blocking is off: these averages are now the baseline"
+    else:
+        baseline = _load_baseline()
+        if baseline:
+            kb_saved = baseline["kb"] - kb
+            ms_saved = baseline["load_ms"] - load_ms
+            saving = (
+                f"<br><strong style='color: #00ff88;'>SAVED PER PAGE:</strong> {kb_saved:.0f} KB · {ms_saved:.0f} ms"
+                f"<br><strong style='color: #00ff88;'>SAVED THIS RUN:</strong> {kb_saved * pages / 1024:.1f} MB · {ms_saved * pages / 1000:.0f}s"
+            )
+        else:
+            saving = "<br>Run once with RESOURCE_BLOCKING=0 to record a baseline for the saving"
+
+    st.markdown(f"""
+    <div class="main-container">
+    <h3 style="text-align: center;">📦 PAGE LOAD REPORT</h3>
+    <p style="text-align: center; font-size: 18px;">
+    <strong>PAGES LOADED:</strong> {pages}<br>
+    <strong>PER PAGE:</strong> {kb:.0f} KB · {requests:.0f} requests · {load_ms:.0f} ms
+    {saving}
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,72 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+import requests
+from selenium.common.exceptions import (
+    TimeoutException, StaleElementReferenceException, ElementClickInterceptedException,
+)
+
+# Per-form attempts, end-of-run tenderer retry rounds and their back-off (seconds)
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+RETRY_ROUNDS = int(os.getenv("RETRY_ROUNDS", "1"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "2"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "60"))
+# Global slow-down: once THROTTLE_ERROR_RATE of the last THROTTLE_WINDOW portal
+# operations failed, every worker pauses before its next one
+THROTTLE_WINDOW = int(os.getenv("THROTTLE_WINDOW", "20"))
+THROTTLE_ERROR_RATE = float(os.getenv("THROTTLE_ERROR_RATE", "0.3"))
+THROTTLE_MAX_PAUSE = float(os.getenv("THROTTLE_MAX_PAUSE", "30"))
+
+class TransientError(Exception):
+    """A failure expected to clear up on retry (slow portal, half-saved submission)"""
+
+TRANSIENT_ERRORS = (
+    TransientError, TimeoutException, StaleElementReferenceException, ElementClickInterceptedException,
+    requests.ConnectionError, requests.Timeout,
+)
+
+def is_transient(error):
+    """True for failures worth retrying; missing links, fields or tenderers are permanent"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, TRANSIENT_ERRORS)
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Exponential back-off with jitter for the given 0-based retry attempt"""
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+class ErrorRateThrottle:
+    """Process-wide pause shared by all workers while the portal's recent error rate is high.
+
+    Each failure during a spike doubles the pause (up to `max_pause`); each
+    success halves it again.
+    """
+
+    def __init__(self, window=THROTTLE_WINDOW, threshold=THROTTLE_ERROR_RATE, max_pause=THROTTLE_MAX_PAUSE, base_pause=1.0):
+        self.threshold = threshold
+        self.max_pause = max_pause
+        self.base_pause = base_pause
+        self.pause = 0.0
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, ok):
+        with self._lock:
+            self._outcomes.append(ok)
+            errors = self._outcomes.count(False)
+            spiking = len(self._outcomes) >= self._outcomes.maxlen // 4 and errors / len(self._outcomes) >= self.threshold
+            if not ok and spiking:
+                self.pause = min(self.max_pause, max(self.base_pause, self.pause * 2))
+            elif ok:
+                self.pause = self.pause / 2 if self.pause >= self.base_pause else 0.0
+
+    def wait(self):
+        """Sleep for the current pause, if any"""
+        with self._lock:
+            pause = self.pause
+        if pause:
+            time.sleep(pause)
+
+portal_throttle = ErrorRateThrottle()
@@ -0,0 +1,156 @@
+import csv
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from reporting import st
+
+# Live log shown during a run: only the newest messages, re-rendered at most once per interval.
+# Everything, including per-form details, also goes to a per-run file offered for download.
+# The result CSV is streamed to the same directory.
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", "30"))
+LOG_REFRESH_SECONDS = float(os.getenv("LOG_REFRESH_SECONDS", "1.0"))
+RUN_LOG_DIR = os.getenv("RUN_LOG_DIR", "run_logs")
+
+def file_label(label):
+    """`label` (e.g. a free-text tender ID) reduced to characters that are safe in a file name"""
+    return re.sub(r"[^\w.-]", "_", str(label).strip())
+
+def _color(message):
+    if "❌" in message or "FAILED" in message:
+        return "#ff0066"
+    if "✅" in message or "COMPLETED" in message:
+        return "#00ff88"
+    if "⚠️" in message:
+        return "#ffc107"
+    return "#00ffff"
+
+class RunLog:
+    """Ring-buffer log with throttled rendering and a detail file.
+
+    `add` shows a message in the live log, `detail` only writes it to the
+    file, and `status` updates the single "current form" line. Safe to call
+    from worker threads.
+    """
+
+    def __init__(self, label=None, size=LOG_BUFFER_SIZE, refresh_seconds=LOG_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._messages = deque(maxlen=size)
+        self._status = ""
+        self._dirty = False
+        self._last_render = 0.0
+        self._lock = threading.Lock()
+        self._status_placeholder = st.empty()
+        self._log_placeholder = st.empty()
+
+        self.path = None
+        self._file = None
+        if label:
+            os.makedirs(RUN_LOG_DIR, exist_ok=True)
+            self.path = os.path.join(RUN_LOG_DIR, f"details_{file_label(label)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def add(self, message):
+        """Show a message in the live log (newest first) and record it"""
+        with self._lock:
+            self._messages.append(message)
+            self._dirty = True
+        self._write(message)
+        self._maybe_render()
+
+    def detail(self, message):
+        """Record a message in the detail file only"""
+        self._write(message)
+
+    def status(self, html):
+        """Replace the current-activity line"""
+        with self._lock:
+            self._status = html
+            self._dirty = True
+        self._maybe_render()
+
+    def flush(self):
+        """Render pending changes now"""
+        self._maybe_render(force=True)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def offer_download(self):
+        """Show a download button for the detail file"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            st.empty().download_button(
+                label="📄 Download Detailed Log",
+                data=f,
+                file_name=os.path.basename(self.path),
+                mime="text/plain"
+            )
+
+    def _write(self, message):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {message.strip()}\n")
+                self._file.flush()
+
+    def _maybe_render(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty or (not force and now - self._last_render < self.refresh_seconds):
+                return
+            self._dirty = False
+            self._last_render = now
+            status = self._status
+            messages = list(self._messages)
+
+        if status:
+            self._status_placeholder.markdown(status, unsafe_allow_html=True)
+        log_html = "".join(
+            f"<p style='color: {_color(msg)}; font-size: 14px; margin: 2px 0;'>{msg}</p>"
+            for msg in reversed(messages)
+        )
+        self._log_placeholder.markdown(log_html, unsafe_allow_html=True)
+
+class CsvLog:
+    """Result rows appended to a per-run CSV file, synced to disk row by row so the log survives a crash"""
+
+    def __init__(self, label, header):
+        os.makedirs(RUN_LOG_DIR, exist_ok=True)
+        self.path = os.path.join(RUN_LOG_DIR, f"log_{file_label(label)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        self.rows = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._write(header)
+
+    def append(self, row):
+        self._write(row)
+        self.rows += 1
+
+    def _write(self, row):
+        with self._lock:
+            self._writer.writerow(row)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def offer_download(self, placeholder):
+        """Show the download button for the CSV in `placeholder`, streaming the file"""
+        with open(self.path, "rb") as f:
+            placeholder.download_button(
+                label=f"📥 Download Log ({self.rows} entries)",
+                data=f,
+                file_name=os.path.basename(self.path),
+                mime="text/csv"
+            )
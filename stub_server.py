@@ -0,0 +1,122 @@
+# Local stub of eprocure.gov.bd that replays recorded pages, for exercising the
+# HTTP fast path (and the browser flow) without touching the live portal.
+#
+# A recording directory holds the saved HTML files plus an index.json mapping
+# "METHOD /path?query" to the responses to replay, in order (the last one
+# repeats), e.g.
+#
+#   {
+#     "GET /officer/EvalForms.jsp?uid=7": [{"file": "forms_1.html"}, {"file": "forms_2.html"}],
+#     "GET /officer/EvalFormPage.jsp?formId=11": [{"file": "form_11.html"}],
+#     "POST /officer/EvalFormPage.jsp": [{"redirect": "/officer/EvalForms.jsp?uid=7"}]
+#   }
+#
+# Usage: python stub_server.py recordings/ --port 8765
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+INDEX_FILE = "index.json"
+
+def record_page(driver, directory, method="GET"):
+    """Save the browser's current page into a recording directory's index"""
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, INDEX_FILE)
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+
+    url = urlsplit(driver.current_url)
+    key = f"{method} {url.path}" + (f"?{url.query}" if url.query else "")
+    file_name = f"page_{sum(len(v) for v in index.values()) + 1:04d}.html"
+    with open(os.path.join(directory, file_name), "w", encoding="utf-8") as f:
+        f.write(driver.page_source)
+
+    index.setdefault(key, []).append({"file": file_name})
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return key
+
+class StubPortal(ThreadingHTTPServer):
+    """Replays a recording directory; posted form bodies are kept in `posts`"""
+
+    daemon_threads = True
+
+    def __init__(self, directory, address=("127.0.0.1", 8765)):
+        super().__init__(address, StubHandler)
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.hits = {}
+        self.posts = []
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_response(self, key):
+        """Return the next recorded response for a request key, or None"""
+        responses = self.index.get(key)
+        if not responses:
+            return None
+        with self._lock:
+            hit = self.hits.get(key, 0)
+            self.hits[key] = hit + 1
+        return responses[min(hit, len(responses) - 1)]
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._replay("GET")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", "replace")
+        with self.server._lock:
+            self.server.posts.append((self.path, body))
+        self._replay("POST")
+
+    def _replay(self, method):
+        # POSTs are matched on path only; their bodies vary per submission
+        key = f"{method} {urlsplit(self.path).path}" if method == "POST" else f"{method} {self.path}"
+        response = self.server.next_response(key)
+        if response is None:
+            self.send_error(404, f"No recording for {key}")
+            return
+
+        if "redirect" in response:
+            self.send_response(response.get("status", 302))
+            self.send_header("Location", response["redirect"])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with open(os.path.join(self.server.directory, response["file"]), "rb") as f:
+            body = f.read()
+        self.send_response(response.get("status", 200))
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded eprocure pages locally")
+    parser.add_argument("directory", help="recording directory containing index.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = StubPortal(args.directory, (args.host, args.port))
+    print(f"Replaying {args.directory} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,187 @@
+import contextlib
+import re
+import pytest
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import automation
+import outcomes
+from automation import process_tenderer_forms, FILL_AND_SUBMIT_JS, ROW_ACTION_TEXT_JS
+from retry import TransientError, RETRY_ATTEMPTS
+from timing import StepTimings
+
+class StubLimiter:
+    def acquire(self, driver=None, cost=1):
+        pass
+
+    def observe(self, seconds):
+        pass
+
+    @contextlib.contextmanager
+    def paced(self, driver=None, cost=1):
+        yield
+
+class StubThrottle:
+    def wait(self):
+        pass
+
+    def record(self, ok):
+        pass
+
+class StubLog:
+    def __init__(self):
+        self.lines = []
+
+    def add(self, message):
+        self.lines.append(message)
+
+    detail = add
+
+    def status(self, html):
+        pass
+
+class StubCheckpoint:
+    def __init__(self, done=()):
+        self.done = set(done)
+        self.forms = []
+        self.tenderers = []
+
+    def completed_forms(self, tender_id, tenderer_name):
+        return self.done
+
+    def mark_form_done(self, tender_id, tenderer_name, form_key, form_name):
+        self.forms.append(form_key)
+
+    def mark_tenderer_done(self, tender_id, tenderer_name, forms_count):
+        self.tenderers.append((tenderer_name, forms_count))
+
+class StubLink:
+    def __init__(self, driver, row_id):
+        self.driver, self.row_id = driver, row_id
+
+    def click(self):
+        self.driver.opened.append(self.row_id)
+        self.driver.open_row = self.row_id
+
+class StubWait:
+    def until(self, condition):
+        return object()
+
+class StubDriver:
+    """A forms table whose posts follow a per-row script of outcomes:
+    "ok", "lost" (the post is not saved) or "slow" (saved, but the table reload times out)"""
+
+    current_url = "https://portal/forms"
+
+    def __init__(self, actions, scripts=None):
+        self.actions = dict(actions)  # row ID -> action text
+        self.scripts = {row_id: list(script) for row_id, script in (scripts or {}).items()}
+        self.opened = []
+        self.posts = []
+        self.open_row = None
+        self.slow = False
+
+    def form_rows(self):
+        rows = []
+        for row_id, action in self.actions.items():
+            links = [{"text": action, "href": f"https://portal/eval?row={row_id}"}] if action == "Evaluate Form" else []
+            rows.append({"id": row_id, "cells": [
+                {"text": row_id, "links": [{"text": row_id, "href": "#"}]},
+                {"text": "Technical", "links": []},
+                {"text": action, "links": links},
+            ]})
+        return rows
+
+    def find_element(self, by, selector):
+        row_id = re.search(r"@id='([^']+)'", selector).group(1)
+        if self.actions.get(row_id) != "Evaluate Form":
+            raise NoSuchElementException(f"No Evaluate Form link in {row_id}")
+        return StubLink(self, row_id)
+
+    def execute_script(self, script, *args):
+        if script == FILL_AND_SUBMIT_JS:
+            outcome = (self.scripts.get(self.open_row) or ["ok"]).pop(0)
+            self.posts.append(self.open_row)
+            if outcome != "lost":
+                self.actions[self.open_row] = "Form Evaluated"
+            self.slow = outcome == "slow"
+            return {"button": object()}
+        if script == ROW_ACTION_TEXT_JS:
+            return self.actions.get(args[0])
+        return None
+
+    def after_post(self, driver, button):
+        if self.slow:
+            raise TimeoutException("Forms table did not reload")
+
+@pytest.fixture
+def portal(monkeypatch):
+    def make(actions, scripts=None):
+        driver = StubDriver(actions, scripts)
+        monkeypatch.setattr(automation, "wait_for_forms_table", lambda driver: None)
+        monkeypatch.setattr(automation, "extract_form_rows", lambda driver: driver.form_rows())
+        monkeypatch.setattr(automation, "load_page", lambda driver, url: None)
+        monkeypatch.setattr(automation, "wait_for_navigation", driver.after_post)
+        monkeypatch.setattr(automation, "drain_dialogs", lambda driver: [])
+        monkeypatch.setattr(automation, "portal_limiter", StubLimiter())
+        monkeypatch.setattr(automation, "portal_throttle", StubThrottle())
+        monkeypatch.setattr(outcomes, "portal_throttle", StubThrottle())
+        monkeypatch.setattr(outcomes, "backoff_delay", lambda attempt: 0)
+        return driver
+    return make
+
+def run(driver, checkpoint):
+    return process_tenderer_forms(driver, StubWait(), "ok", "ACME", StubLog(), checkpoint=checkpoint, tender_id="1")
+
+def test_queue_skips_evaluated_and_checkpointed_forms(portal):
+    driver = portal({"r1": "Evaluate Form", "r2": "Form Evaluated", "r3": "Evaluate Form", "r4": "Evaluate Form"})
+    checkpoint = StubCheckpoint(done={"r3"})
+    assert run(driver, checkpoint) == 2
+    assert driver.opened == ["r1", "r4"]
+    assert checkpoint.forms == ["r1", "r4"]
+    assert checkpoint.tenderers == [("ACME", 2)]
+
+def test_lost_post_is_requeued_behind_the_rest(portal):
+    driver = portal({"r1": "Evaluate Form", "r2": "Evaluate Form"}, {"r1": ["lost", "ok"]})
+    checkpoint = StubCheckpoint()
+    assert run(driver, checkpoint) == 2
+    assert driver.posts == ["r1", "r2", "r1"]
+    assert checkpoint.forms == ["r2", "r1"]
+
+def test_form_failing_every_attempt_fails_the_tenderer_transiently(portal):
+    driver = portal({"r1": "Evaluate Form", "r2": "Evaluate Form"}, {"r1": ["lost"] * RETRY_ATTEMPTS})
+    checkpoint = StubCheckpoint()
+    with pytest.raises(TransientError, match="1 forms failed"):
+        run(driver, checkpoint)
+    assert checkpoint.forms == ["r2"]
+    assert checkpoint.tenderers == []
+
+def test_post_saved_before_a_timeout_is_not_posted_again(portal):
+    driver = portal({"r1": "Evaluate Form"}, {"r1": ["slow"]})
+    checkpoint = StubCheckpoint()
+    assert run(driver, checkpoint) == 1
+    assert driver.posts == ["r1"]
+    assert checkpoint.forms == ["r1"]
+
+class AdmitAll:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def wait_for_turn(self, worker_num, give_up=lambda: False):
+        return True
+
+    def admits(self, worker_num):
+        return True
+
+class NoBrowsers:
+    def acquire(self):
+        raise RuntimeError("Chrome failed to start")
+
+def test_tenderers_left_by_stopped_workers_go_to_the_retry(monkeypatch):
+    def no_session(driver):
+        raise RuntimeError("Browser lost")
+    monkeypatch.setattr(automation, "ConcurrencyController", AdmitAll)
+    monkeypatch.setattr(automation, "get_driver_pool", NoBrowsers)
+    monkeypatch.setattr(automation, "session_from_driver", no_session)
+    tenderers = [(1, "ACME", "Evaluate Tenderer", "https://portal/t1"), (2, "Beta", "Evaluate Tenderer", "https://portal/t2")]
+    events = list(automation.run_worker_pool("a@b", "pw", "1", "ok", object(), tenderers, 2, 2, StepTimings(), fast_path=True, run_log=StubLog()))
+    assert sorted(payload for kind, payload in events if kind == "failed") == [(tenderer, True) for tenderer in tenderers]
+    assert sorted(payload[1] for kind, payload in events if kind == "result") == [1, 2]
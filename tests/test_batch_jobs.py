@@ -0,0 +1,9 @@
+from batch_jobs import parse_batch_jobs
+
+def test_lines_with_optional_remarks():
+    text = "100, Looks fine\n200\n\n# comment\n100, duplicate\n"
+    assert parse_batch_jobs(text, "Default") == [("100", "Looks fine"), ("200", "Default")]
+
+def test_csv_header_is_skipped():
+    text = "Tender ID,Remark\n300,\"Okay, accepted\"\n"
+    assert parse_batch_jobs(text, "Default") == [("300", "Okay, accepted")]
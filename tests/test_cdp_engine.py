@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+import cdp_engine
+import outcomes
+from automation import FILL_AND_SUBMIT_JS, ROW_ACTION_TEXT_JS
+from cdp_engine import Tab, evaluate_tenderer_in_tab
+from extract import TABLES_JS
+from retry import TransientError
+from timing import StepTimings
+
+class StubConnection:
+    """Answers Page.navigate with `reply` and then fires `loads` (loaderIds) as load events"""
+
+    def __init__(self, reply, loads):
+        self.reply = reply
+        self.loads = loads
+        self.tab = None
+
+    async def send(self, method, params=None, session_id=None):
+        if method == "Page.navigate":
+            asyncio.get_running_loop().create_task(self._fire_loads())
+            return self.reply
+        return {}
+
+    async def _fire_loads(self):
+        for loader_id in self.loads:
+            await asyncio.sleep(0.01)
+            self.tab._on_event("Page.lifecycleEvent", {"name": "load", "frameId": "target", "loaderId": loader_id})
+
+def navigate(reply, loads, timeout=1):
+    async def run():
+        connection = StubConnection(reply, loads)
+        connection.tab = tab = Tab(connection, "target", "session")
+        started = asyncio.get_running_loop().time()
+        await tab.navigate("https://portal/forms", timeout)
+        return asyncio.get_running_loop().time() - started, tab
+    return asyncio.run(run())
+
+def test_navigate_ignores_a_late_load_of_the_previous_document():
+    elapsed, tab = navigate({"frameId": "target", "loaderId": "new"}, ["old", "new"])
+    assert tab._loader_id == "new"
+    assert elapsed >= 0.02
+
+def test_navigate_times_out_without_the_new_document_load():
+    with pytest.raises(TransientError, match="timed out"):
+        navigate({"frameId": "target", "loaderId": "new"}, ["old"], timeout=0.1)
+
+def test_navigate_error_is_transient():
+    with pytest.raises(TransientError, match="net::ERR_CONNECTION_RESET"):
+        navigate({"frameId": "target", "errorText": "net::ERR_CONNECTION_RESET"}, [])
+
+class StubLimiter:
+    def acquire(self, driver=None, cost=1):
+        pass
+
+    def observe(self, seconds):
+        pass
+
+class StubThrottle:
+    def wait(self):
+        pass
+
+    def record(self, ok):
+        pass
+
+class StubLog:
+    def add(self, message):
+        pass
+
+    detail = add
+
+class StubTab:
+    """A tenderer page with one forms table; posts are saved, but the first one's reload times out"""
+
+    def __init__(self, links=True):
+        self.actions = {"r1": "Evaluate Form", "r2": "Evaluate Form"}
+        self.links = links
+        self.page = None
+        self.posts = []
+
+    def expect_load(self):
+        pass
+
+    async def wait_for_load(self):
+        if len(self.posts) == 1:
+            raise TransientError("Page load timed out")
+
+    async def navigate(self, url):
+        self.page = url
+
+    async def drain_dialogs(self):
+        return []
+
+    async def evaluate(self, script, *args):
+        if script == TABLES_JS:
+            rows = []
+            for row_id, action in self.actions.items():
+                link = {"text": action, "href": f"https://portal/eval?row={row_id}" if self.links else "javascript:void(0)"}
+                rows.append({"id": row_id, "cells": [
+                    {"text": row_id, "links": [{"text": row_id, "href": "#"}]},
+                    {"text": "Technical", "links": []},
+                    {"text": action, "links": [link] if action == "Evaluate Form" else []},
+                ]})
+            return [{"headers": [], "rows": rows}]
+        if script == FILL_AND_SUBMIT_JS:
+            row_id = self.page.rsplit("=", 1)[1]
+            self.posts.append(row_id)
+            self.actions[row_id] = "Form Evaluated"
+            return {}
+        if script == ROW_ACTION_TEXT_JS:
+            return self.actions[args[0]]
+
+@pytest.fixture
+def stub_portal(monkeypatch):
+    monkeypatch.setattr(cdp_engine, "portal_limiter", StubLimiter())
+    monkeypatch.setattr(cdp_engine, "portal_throttle", StubThrottle())
+    monkeypatch.setattr(outcomes, "portal_throttle", StubThrottle())
+    monkeypatch.setattr(outcomes, "backoff_delay", lambda attempt: 0)
+
+def evaluate(tab):
+    tenderer = (1, "ACME", "Evaluate Tenderer", "https://portal/tenderer")
+    return asyncio.run(evaluate_tenderer_in_tab(tab, None, tenderer, "ok", StepTimings(), StubLog()))
+
+def test_post_that_went_through_is_not_posted_again(stub_portal):
+    tab = StubTab()
+    assert evaluate(tab) == 2
+    assert tab.posts == ["r1", "r2"]
+
+def test_forms_without_a_url_are_left_to_the_browser(stub_portal):
+    tab = StubTab(links=False)
+    with pytest.raises(TransientError, match="browser"):
+        evaluate(tab)
+    assert tab.posts == []
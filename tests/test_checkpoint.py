@@ -0,0 +1,37 @@
+from checkpoint import CheckpointStore, FreshRunCheckpoint
+
+def test_forms_and_tenderers_are_recorded(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.mark_form_done("100", "Acme", "fformtr_1", "FORM")
+    store.mark_form_done("100", "Acme", "fformtr_2", "FORM")
+    store.mark_tenderer_done("100", "Acme", 2)
+    assert store.completed_forms(100, "Acme") == {"fformtr_1", "fformtr_2"}
+    assert store.completed_forms("100", "Other") == set()
+    assert store.completed_tenderers("100") == {"Acme"}
+
+    store.clear("100")
+    assert store.completed_forms("100", "Acme") == set()
+    assert store.completed_tenderers("100") == set()
+    store.close()
+
+def test_tender_queue_keeps_done_tenders(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.enqueue_tenders([("1", "ok"), ("2", "ok")])
+    store.set_tender_status("1", "DONE", "all good")
+    store.enqueue_tenders([("1", "ok"), ("2", "ok")])
+    assert [(row["tender_id"], row["status"]) for row in store.tender_queue()] == [("1", "DONE"), ("2", "PENDING")]
+    store.enqueue_tenders([("1", "ok")], requeue_done=True)
+    assert store.tender_queue(["1"])[0]["status"] == "PENDING"
+    store.close()
+
+def test_fresh_run_ignores_earlier_runs_but_records(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.mark_form_done("100", "Acme", "fformtr_1", "FORM")
+    fresh = FreshRunCheckpoint(store)
+    assert fresh.completed_forms("100", "Acme") == set()
+    fresh.mark_form_done("100", "Acme", "fformtr_2", "FORM")
+    assert fresh.completed_forms("100", "Acme") == {"fformtr_2"}
+    assert store.completed_forms("100", "Acme") == {"fformtr_1", "fformtr_2"}
+    fresh.mark_tenderer_done("100", "Acme", 1)
+    assert store.completed_tenderers("100") == {"Acme"}
+    store.close()
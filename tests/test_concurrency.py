@@ -0,0 +1,59 @@
+import types
+import pytest
+import concurrency
+from concurrency import ConcurrencyController, MEMORY_RESERVE_MB, CPU_LOAD_LIMIT
+from rate_limit import LATENCY_TARGET
+
+@pytest.fixture
+def machine(monkeypatch):
+    state = types.SimpleNamespace(memory=None, load=None, latency=None, browser=None)
+    monkeypatch.setattr(concurrency, "available_memory_mb", lambda: state.memory)
+    monkeypatch.setattr(concurrency, "cpu_load", lambda: state.load)
+    monkeypatch.setattr(concurrency, "browser_over_ceiling", lambda driver: state.browser)
+    monkeypatch.setattr(concurrency, "portal_limiter", state)
+    return state
+
+def test_starts_with_what_free_memory_affords(machine):
+    machine.memory = MEMORY_RESERVE_MB + 250
+    assert ConcurrencyController(4, worker_mb=100, check_seconds=0).allowed == 3
+    machine.memory = 0
+    assert ConcurrencyController(4, worker_mb=100, check_seconds=0).allowed == 1
+    machine.memory = None
+    assert ConcurrencyController(4, worker_mb=100, check_seconds=0).allowed == 4
+
+@pytest.mark.parametrize("pressure", ["memory", "load", "latency", "browser"])
+def test_steps_down_under_pressure(machine, pressure):
+    changes = []
+    controller = ConcurrencyController(3, worker_mb=100, driver=object(), on_change=changes.append, check_seconds=0)
+    setattr(machine, pressure, {
+        "memory": MEMORY_RESERVE_MB - 1,
+        "load": CPU_LOAD_LIMIT + 0.5,
+        "latency": LATENCY_TARGET + 1,
+        "browser": 2000.0,
+    }[pressure])
+    controller.update()
+    assert controller.allowed == 2
+    assert not controller.admits(3) and controller.admits(1)  # admits() re-checks: down to 1
+    assert controller.allowed == 1
+    controller.update()
+    assert controller.allowed == 1  # Never below one worker
+    assert len(changes) == 2 and "3 → 2" in changes[0]
+
+def test_steps_up_with_headroom_up_to_the_maximum(machine):
+    machine.memory = 0
+    controller = ConcurrencyController(2, worker_mb=100, check_seconds=0)
+    assert controller.allowed == 1
+    machine.memory = MEMORY_RESERVE_MB + 50
+    controller.update()
+    assert controller.allowed == 1  # Not enough room for another worker
+    machine.memory = MEMORY_RESERVE_MB + 100
+    controller.update()
+    controller.update()
+    assert controller.allowed == 2
+
+def test_re_evaluates_only_when_due(machine):
+    controller = ConcurrencyController(3, worker_mb=100, check_seconds=60)
+    controller.update()
+    machine.load = CPU_LOAD_LIMIT + 1
+    controller.update()
+    assert controller.allowed == 3
@@ -0,0 +1,26 @@
+import json
+from dialogs import drain_dialogs, DRAIN_DIALOGS_JS
+
+class StubDriver:
+    def __init__(self, stored=None, error=None):
+        self.stored = stored
+        self.error = error
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        if self.error:
+            raise self.error
+        return self.stored
+
+def test_drain_returns_the_captured_messages():
+    driver = StubDriver(json.dumps(["alert: Saved", "confirm: Post the form?"]))
+    assert drain_dialogs(driver) == ["alert: Saved", "confirm: Post the form?"]
+    assert driver.scripts == [DRAIN_DIALOGS_JS]
+
+def test_drain_without_captured_dialogs():
+    assert drain_dialogs(StubDriver(None)) == []
+    assert drain_dialogs(StubDriver("")) == []
+
+def test_drain_on_a_page_without_session_storage():
+    assert drain_dialogs(StubDriver(error=Exception("sessionStorage is not available"))) == []
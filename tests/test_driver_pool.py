@@ -0,0 +1,62 @@
+import itertools
+import threading
+import time
+import driver_pool
+from driver_pool import DriverPool
+
+class FakeDriver:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+def slow_launches(monkeypatch, seconds=0.2):
+    launched = []
+    ids = itertools.count(1)
+    lock = threading.Lock()
+
+    def launch():
+        time.sleep(seconds)
+        with lock:
+            driver = FakeDriver(next(ids))
+            launched.append(driver)
+        return driver
+
+    monkeypatch.setattr(driver_pool, "get_chrome_driver", launch)
+    return launched
+
+def test_acquire_waits_for_the_warm_up_launch(monkeypatch):
+    launched = slow_launches(monkeypatch)
+    pool = DriverPool(size=1)
+    pool.warm_up_in_background()
+    driver = pool.acquire()  # Right after the initializer, as in a fresh worker process
+    time.sleep(0.4)  # Long enough for a second launch to show up
+    assert launched == [driver]
+
+def test_concurrent_warm_ups_stay_within_size(monkeypatch):
+    launched = slow_launches(monkeypatch)
+    pool = DriverPool(size=2)
+    threads = [threading.Thread(target=pool.warm_up) for _ in range(4)]
+    for _ in range(3):
+        pool.warm_up_in_background()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    first, second = pool.acquire(), pool.acquire()
+    assert len(launched) == 2 and {first, second} == set(launched)
+
+def test_release_keeps_at_most_size_idle(monkeypatch):
+    launched = slow_launches(monkeypatch, seconds=0)
+    pool = DriverPool(size=1)
+    first, second = pool.acquire(), pool.acquire()
+    monkeypatch.setattr(pool, "_reset", lambda driver: True)
+    pool.release(first)
+    pool.release(second)
+    assert second.quit_called and not first.quit_called
+    assert pool.acquire() is first
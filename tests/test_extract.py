@@ -0,0 +1,21 @@
+from extract import classify_form_rows
+
+def form_row(row_id, name=None, action="Evaluate Form"):
+    name_cell = {"text": name or "", "links": [{"text": name, "href": "#"}] if name else []}
+    action_links = [{"text": action, "href": f"/eval?row={row_id}"}] if action == "Evaluate Form" else []
+    return {"id": row_id, "cells": [name_cell, {"text": "Technical", "links": []}, {"text": action, "links": action_links}]}
+
+def test_pending_and_evaluated_rows():
+    rows = [form_row("fformtr_1", "A"), form_row("fformtr_2", "B", "Form Evaluated"), form_row("fformtr_3", "C", "View")]
+    pending, evaluated = classify_form_rows(rows)
+    assert [(row_id, name) for row_id, name, _ in pending] == [("fformtr_1", "A")]
+    assert pending[0][2]["href"] == "/eval?row=fformtr_1"
+    assert evaluated == 1
+
+def test_checkpoints_match_row_ids_not_names():
+    # Unnamed forms all display as FORM; duplicates share a name
+    rows = [form_row("fformtr_1"), form_row("fformtr_2"), form_row("fformtr_3", "Same"), form_row("fformtr_4", "Same")]
+    pending, evaluated = classify_form_rows(rows, {"fformtr_1", "fformtr_3", "FORM", "Same"})
+    assert [row_id for row_id, _, _ in pending] == ["fformtr_2", "fformtr_4"]
+    assert [name for _, name, _ in pending] == ["FORM", "Same"]
+    assert evaluated == 2
@@ -0,0 +1,90 @@
+import json
+import threading
+import requests
+import pytest
+from extract import classify_form_rows, cell_text
+from http_engine import parse_form_rows, parse_eval_form, build_eval_payload, fetch_form_rows, submit_evaluation
+from mock_portal import MockPortal, SESSION_COOKIE
+from stub_server import StubPortal, INDEX_FILE
+
+FORMS_PAGE = """<table class="tableList_1">
+<tr><th>Form Name</th><th>Type</th><th>Action</th></tr>
+<tr id="fformtr_1"><td><a href="/ViewForm.jsp?formId=1">Price Schedule</a></td><td>Technical</td>
+<td><a href="/officer/EvalFormPage.jsp?formId=1">Evaluate Form</a></td></tr>
+<tr id="fformtr_2"><td><a href="/ViewForm.jsp?formId=2">Price Schedule</a></td><td>Technical</td>
+<td>Form Evaluated</td></tr>
+</table>"""
+
+EVAL_FORM_PAGE = """<form method="post" action="/officer/EvalFormPage.jsp">
+<input type="hidden" name="formId" value="1">
+<input type="radio" id="techQualify" name="techQualify" value="Qualified">
+<input type="radio" id="techDisqualify" name="techQualify" value="Disqualified" checked>
+<input type="checkbox" name="notify">
+<textarea id="evalNonCompRemarks" name="evalNonCompRemarks">old</textarea>
+<input type="submit" id="btnPost" name="btnPost" value="Post">
+<input type="button" id="btnCancel" name="btnCancel" value="Cancel">
+</form>"""
+
+def test_parse_form_rows():
+    rows = parse_form_rows(FORMS_PAGE)
+    assert [row["id"] for row in rows] == ["fformtr_1", "fformtr_2"]
+    assert rows[0]["cells"][2]["links"] == [{"text": "Evaluate Form", "href": "/officer/EvalFormPage.jsp?formId=1"}]
+    assert cell_text(rows[1], 2) == "Form Evaluated"
+
+def test_build_eval_payload_accepts_and_remarks():
+    payload = build_eval_payload(parse_eval_form(EVAL_FORM_PAGE), "Looks fine")
+    assert payload == [
+        ("formId", "1"),
+        ("techQualify", "Qualified"),
+        ("evalNonCompRemarks", "Looks fine"),
+        ("btnPost", "Post"),
+    ]
+
+def test_build_eval_payload_requires_fields():
+    form = parse_eval_form(EVAL_FORM_PAGE.replace('id="techQualify"', 'id="other"'))
+    with pytest.raises(Exception):
+        build_eval_payload(form, "x")
+
+def test_fast_path_against_stub_portal(tmp_path):
+    (tmp_path / "forms_1.html").write_text(FORMS_PAGE)
+    (tmp_path / "forms_2.html").write_text(FORMS_PAGE.replace(
+        '<td><a href="/officer/EvalFormPage.jsp?formId=1">Evaluate Form</a></td>', "<td>Form Evaluated</td>"))
+    (tmp_path / "form_1.html").write_text(EVAL_FORM_PAGE)
+    (tmp_path / INDEX_FILE).write_text(json.dumps({
+        "GET /officer/EvalForms.jsp?uid=7": [{"file": "forms_1.html"}, {"file": "forms_2.html"}],
+        "GET /officer/EvalFormPage.jsp?formId=1": [{"file": "form_1.html"}],
+        "POST /officer/EvalFormPage.jsp": [{"redirect": "/officer/EvalForms.jsp?uid=7"}],
+    }))
+    portal = StubPortal(str(tmp_path), ("127.0.0.1", 0))
+    threading.Thread(target=portal.serve_forever, daemon=True).start()
+    try:
+        forms_url = f"{portal.base_url}/officer/EvalForms.jsp?uid=7"
+        session = requests.Session()
+        pending, evaluated = classify_form_rows(fetch_form_rows(session, forms_url))
+        assert [(row_id, link["href"]) for row_id, _, link in pending] == [("fformtr_1", "/officer/EvalFormPage.jsp?formId=1")]
+        assert evaluated == 1
+
+        rows = submit_evaluation(session, forms_url, pending[0][2]["href"], "Looks fine")
+        assert all("Form Evaluated" in cell_text(row, 2) for row in rows)
+        assert "evalNonCompRemarks=Looks+fine" in portal.posts[0][1]
+    finally:
+        portal.shutdown()
+        portal.server_close()
+
+def test_fast_path_against_mock_portal():
+    portal = MockPortal(tenderers=1, forms=3).serve_in_background()
+    try:
+        session = requests.Session()
+        session.post(f"{portal.base_url}/Login.jsp", data={"emailId": "a@b.c", "password": "x"}, allow_redirects=False)
+        assert SESSION_COOKIE in session.cookies
+        forms_url = f"{portal.base_url}/officer/EvalTenderer.jsp?tenderid={portal.tender_ids[0]}&uid=1"
+
+        pending, evaluated = classify_form_rows(fetch_form_rows(session, forms_url))
+        assert (len(pending), evaluated) == (3, 0)
+        for row_id, _, link in pending:
+            rows = submit_evaluation(session, forms_url, link["href"], "Looks fine")
+            assert "Form Evaluated" in cell_text(next(row for row in rows if row["id"] == row_id), 2)
+        assert portal.completed_tenderers() == 1
+    finally:
+        portal.shutdown()
+        portal.server_close()
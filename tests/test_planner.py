@@ -0,0 +1,32 @@
+import pytest
+from planner import order_work_plan, estimate_runtime, PLAN_SECONDS_PER_FORM, PLAN_SECONDS_PER_FORM_FAST, PLAN_SECONDS_PER_TENDERER
+from timing import StepTimings
+
+def tenderer(num):
+    return (num, f"T{num}", "Evaluate Tenderer", f"https://portal/t{num}")
+
+def entry(num, pending, evaluated=0):
+    return {"tenderer": tenderer(num), "pending": pending, "evaluated": evaluated}
+
+def test_order_runs_unscanned_then_largest_and_sets_idle_aside():
+    plan = [entry(1, 2), entry(2, 0, 5), entry(3, None, None), entry(4, 7), entry(5, 0)]
+    work, idle = order_work_plan(plan)
+    assert [t[0] for t in work] == [3, 4, 1]
+    assert [t[0] for t in idle] == [2, 5]
+
+def test_estimate_uses_defaults_until_steps_are_measured():
+    plan = [entry(1, 4), entry(2, 2), entry(3, 0)]
+    expected = 6 * PLAN_SECONDS_PER_FORM + 2 * PLAN_SECONDS_PER_TENDERER
+    assert estimate_runtime(plan, 1, False, StepTimings()) == pytest.approx(expected)
+    assert estimate_runtime(plan, 4, False, StepTimings()) == pytest.approx(expected / 2)  # Only two tenderers to share
+    fast = 6 * PLAN_SECONDS_PER_FORM_FAST + 2 * PLAN_SECONDS_PER_TENDERER
+    assert estimate_runtime(plan, 1, True, StepTimings()) == pytest.approx(fast)
+
+def test_estimate_uses_measured_steps_and_sizes_unscanned_tenderers_by_the_average():
+    timings = StepTimings()
+    for step, seconds in (("forms: open form", 1.0), ("forms: fill and submit", 2.0), ("forms: reload table", 1.0),
+                          ("tenderer: open evaluation", 0.5), ("forms: table load", 0.5)):
+        timings.record(step, seconds)
+    plan = [entry(1, 3), entry(2, 5), entry(3, None, None)]
+    # The unscanned tenderer counts as the average of the scanned ones (4 forms)
+    assert estimate_runtime(plan, 1, False, timings) == pytest.approx(12 * 4.0 + 3 * 1.0)
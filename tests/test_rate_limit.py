@@ -0,0 +1,47 @@
+import time
+from types import SimpleNamespace
+from rate_limit import TokenBucket, SharedTokenBucket, PortalRateLimiter, MIN_RATE_SCALE, RATE_LIMIT_BURST
+
+def test_token_bucket_allows_a_burst_then_queues():
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert abs(bucket.reserve() - 0.5) < 0.05
+    assert abs(bucket.reserve() - 1.0) < 0.05
+
+def test_token_bucket_scale_slows_the_rate():
+    bucket = TokenBucket(rate=2, burst=1)
+    bucket.reserve()
+    assert abs(bucket.reserve(scale=0.5) - 1.0) < 0.05
+
+def test_shared_bucket_is_one_budget_across_connections(tmp_path):
+    # Each job process opens its own connection to the same table
+    path = str(tmp_path / "rate.db")
+    first = SharedTokenBucket("global", rate=2, burst=2, path=path)
+    second = SharedTokenBucket("global", rate=2, burst=2, path=path)
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert abs(first.reserve() - 0.5) < 0.05
+    assert abs(second.reserve() - 1.0) < 0.05
+
+def test_limiters_of_two_jobs_share_the_account_budget(tmp_path):
+    path = str(tmp_path / "rate.db")
+    jobs = [PortalRateLimiter(global_rate=100, account_rate=10, path=path) for _ in range(2)]
+    drivers = [SimpleNamespace(session_id=f"session-{n}") for n in range(2)]
+    for limiter, driver in zip(jobs, drivers):
+        limiter.bind(driver, "officer@example.com")
+    start = time.perf_counter()
+    jobs[0].acquire(drivers[0], cost=RATE_LIMIT_BURST)
+    assert time.perf_counter() - start < 0.1
+    # The second job waits for the first job's burst to refill
+    jobs[1].acquire(drivers[1], cost=RATE_LIMIT_BURST)
+    assert time.perf_counter() - start >= RATE_LIMIT_BURST / 10 - 0.05
+
+def test_limiter_adapts_to_latency():
+    limiter = PortalRateLimiter(latency_target=1, path=None)
+    for _ in range(30):
+        limiter.observe(5)
+    assert limiter.scale == MIN_RATE_SCALE
+    for _ in range(100):
+        limiter.observe(0.1)
+    assert limiter.scale == 1.0
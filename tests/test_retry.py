@@ -0,0 +1,39 @@
+import requests
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from retry import TransientError, ErrorRateThrottle, backoff_delay, is_transient
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+def test_is_transient():
+    assert is_transient(TransientError())
+    assert is_transient(TimeoutException())
+    assert is_transient(requests.ConnectionError())
+    assert is_transient(http_error(503))
+    assert is_transient(http_error(429))
+    assert not is_transient(http_error(404))
+    assert not is_transient(NoSuchElementException())
+    assert not is_transient(Exception("no tenderer"))
+
+def test_backoff_delay_grows_and_is_capped():
+    for attempt in range(6):
+        delay = backoff_delay(attempt, base=1, cap=10)
+        assert 0.5 * min(10, 2 ** attempt) <= delay <= 1.5 * min(10, 2 ** attempt)
+
+def test_throttle_pauses_only_during_error_spikes():
+    throttle = ErrorRateThrottle(window=8, threshold=0.5, max_pause=4, base_pause=1)
+    throttle.record(False)
+    assert throttle.pause == 0  # Too few outcomes to call it a spike
+    throttle.record(False)
+    assert throttle.pause == 1
+    throttle.record(False)
+    throttle.record(False)
+    assert throttle.pause == 4  # Doubled, capped at max_pause
+    throttle.record(True)
+    assert throttle.pause == 2
+    throttle.record(True)
+    throttle.record(True)
+    throttle.record(True)
+    assert throttle.pause == 0
@@ -0,0 +1,81 @@
+import csv
+import os
+import types
+import run_log
+from run_log import RunLog, CsvLog, file_label
+
+class Slot:
+    def __init__(self):
+        self.renders = []
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self.renders.append(body)
+
+class Page:
+    def __init__(self):
+        self.slots = []
+
+    def empty(self):
+        self.slots.append(Slot())
+        return self.slots[-1]
+
+def live_log(monkeypatch, **kwargs):
+    page = Page()
+    monkeypatch.setattr(run_log, "st", page)
+    log = RunLog(**kwargs)
+    _, log_slot = page.slots
+    return log, log_slot
+
+def test_live_log_keeps_only_the_newest_messages(monkeypatch):
+    log, slot = live_log(monkeypatch, size=3, refresh_seconds=0)
+    for n in range(1, 6):
+        log.add(f"message {n}")
+    shown = slot.renders[-1]
+    assert "message 1" not in shown and "message 2" not in shown
+    assert shown.index("message 5") < shown.index("message 4") < shown.index("message 3")
+
+def test_rendering_is_throttled_until_flushed(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(run_log, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    log, slot = live_log(monkeypatch, refresh_seconds=1.0)
+    log.add("first")
+    now[0] += 0.5
+    log.add("second")
+    log.detail("file only")
+    assert len(slot.renders) == 1
+    log.flush()
+    assert len(slot.renders) == 2 and "second" in slot.renders[-1]
+    log.flush()  # Nothing new
+    now[0] += 1.5
+    log.add("third")
+    assert len(slot.renders) == 3
+    assert all("file only" not in body for body in slot.renders)
+
+def test_detail_file_gets_every_message(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_log, "RUN_LOG_DIR", str(tmp_path))
+    log, _ = live_log(monkeypatch, label="123", refresh_seconds=0)
+    log.add("shown")
+    log.detail("detail")
+    log.close()
+    lines = open(log.path, encoding="utf-8").read().splitlines()
+    assert [line.split(" ", 2)[2] for line in lines] == ["shown", "detail"]
+
+def test_csv_rows_are_on_disk_as_they_are_appended(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_log, "RUN_LOG_DIR", str(tmp_path))
+    log = CsvLog("123", ["Tenderer", "Status"])
+    log.append(["ACME", "SUCCESS"])
+    with open(log.path, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["Tenderer", "Status"], ["ACME", "SUCCESS"]]
+    log.append(["Beta", "FAILED"])
+    log.close()
+    assert log.rows == 2
+    odd = CsvLog("../12/34", ["Tenderer"])
+    odd.close()
+    assert os.path.dirname(odd.path) == str(tmp_path)
+    with open(log.path, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f))[-1] == ["Beta", "FAILED"]
+
+def test_file_label_keeps_paths_inside_the_log_directory():
+    assert file_label(" 12/34 ") == "12_34"
+    assert file_label("../../etc/x") == ".._.._etc_x"
+    assert file_label("TND-2024.1") == "TND-2024.1"
@@ -0,0 +1,17 @@
+from timing import StepTimings, percentile
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([7], 95) == 7
+
+def test_summary_and_phases():
+    timings = StepTimings()
+    timings.record("forms: submit", 1.0)
+    timings.record("forms: submit", 3.0)
+    timings.record("nav: login", 0.5)
+    name, count, total, avg, p50, p95, worst = timings.summary()[0]
+    assert (name, count, total, avg, p50, p95, worst) == ("forms: submit", 2, 4.0, 2.0, 1.0, 3.0, 3.0)
+    assert timings.phases() == [("forms", 4.0), ("nav", 0.5)]
@@ -1,8 +1,7 @@
+import re
 import streamlit as st
 
-def apply_scifi_theme():
-    """Apply sci-fi themed CSS to the Streamlit app"""
-    st.markdown("""
+THEME_STYLE = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Rajdhani:wght@300;400;600;700&display=swap');
     
@@ -233,7 +232,20 @@ def apply_scifi_theme():
     footer {visibility: hidden;}
     header {visibility: hidden;}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+def _minify_css(style):
+    """Drop comments and collapse whitespace"""
+    style = re.sub(r"/\*.*?\*/", "", style, flags=re.S)
+    return re.sub(r"\s+", " ", style).strip()
+
+# Built once per process; Streamlit still needs it re-sent on every rerun,
+# so keeping it small keeps reruns cheap
+THEME_CSS = _minify_css(THEME_STYLE)
+
+def apply_scifi_theme():
+    """Apply sci-fi themed CSS to the Streamlit app"""
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
 
 def show_copyright():
     """Displays copyright notice at bottom right"""
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from reporting import st
+from run_log import file_label
+
+class StepTimings:
+    """Collects per-step latencies (seconds) and a trace of every timed step for one automation run"""
+
+    def __init__(self):
+        self.samples = {}
+        self.events = []
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name, **labels):
+        """Time the enclosed block and record it under `name`; `labels` are kept in the trace"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, start, labels)
+
+    def record(self, name, seconds, start=None, labels=None):
+        start = time.perf_counter() - seconds if start is None else start
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds)
+            self.events.append({
+                "step": name,
+                "start": start - self._origin,
+                "duration": seconds,
+                "thread": threading.current_thread().name,
+                **(labels or {}),
+            })
+
+    def summary(self):
+        """Return rows of (step, count, total, average, p50, p95, max) ordered by total time"""
+        rows = []
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+        for name, values in samples.items():
+            total = sum(values)
+            rows.append((name, len(values), total, total / len(values),
+                         percentile(values, 50), percentile(values, 95), values[-1]))
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def phases(self):
+        """Total seconds per phase (the step name's prefix before ':'), largest first"""
+        totals = {}
+        for name, _, total, *_ in self.summary():
+            if name.startswith("route:"):
+                continue  # Wraps nav: steps, counting it would double the navigation time
+            phase = name.split(":", 1)[0]
+            totals[phase] = totals.get(phase, 0.0) + total
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def export_trace(self):
+        """The run as JSON in Chrome trace-event format (opens in chrome://tracing or Perfetto),
+        with the per-step summary under "summary"
+        """
+        with self._lock:
+            events = list(self.events)
+        threads = {}
+        trace_events = []
+        for event in events:
+            tid = threads.setdefault(event["thread"], len(threads) + 1)
+            args = {key: value for key, value in event.items() if key not in ("step", "start", "duration", "thread")}
+            trace_events.append({
+                "name": event["step"], "cat": event["step"].split(":", 1)[0], "ph": "X",
+                "ts": round(event["start"] * 1e6), "dur": round(event["duration"] * 1e6),
+                "pid": 1, "tid": tid, "args": args,
+            })
+        for thread_name, tid in threads.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": thread_name}})
+        summary = [
+            {"step": name, "count": count, "total_s": total, "avg_s": avg, "p50_s": p50, "p95_s": p95, "max_s": peak}
+            for name, count, total, avg, p50, p95, peak in self.summary()
+        ]
+        return json.dumps({
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "summary": summary,
+            "traceEvents": trace_events,
+        }, indent=1)
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def render_latency_report(timings, label="run"):
+    """Show the phase breakdown and per-step latency table below the execution summary"""
+    rows = timings.summary()
+    if not rows:
+        return
+
+    phases = timings.phases()
+    phase_total = sum(total for _, total in phases) or 1.0
+    phase_rows = "".join(
+        f"<tr><td>{phase}</td><td>{total:.1f}s</td><td>{total / phase_total:.0%}</td></tr>"
+        for phase, total in phases
+    )
+    table_rows = "".join(
+        f"<tr><td>{name}</td><td>{count}</td><td>{total:.1f}s</td><td>{avg:.2f}s</td>"
+        f"<td>{p50:.2f}s</td><td>{p95:.2f}s</td><td>{peak:.2f}s</td></tr>"
+        for name, count, total, avg, p50, p95, peak in rows
+    )
+    st.markdown(f"""
+    <div class="main-container">
+    <h3 style="text-align: center;">⏱️ STEP LATENCY REPORT</h3>
+    <table style="width: 100%; color: #00ffff;">
+    <tr><th>PHASE</th><th>TIME</th><th>SHARE</th></tr>
+    {phase_rows}
+    </table>
+    <table style="width: 100%; color: #00ffff;">
+    <tr><th>STEP</th><th>COUNT</th><th>TOTAL</th><th>AVG</th><th>P50</th><th>P95</th><th>MAX</th></tr>
+    {table_rows}
+    </table>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.empty().download_button(
+        label="⏱️ Download Timing Trace",
+        data=timings.export_trace(),
+        file_name=f"trace_{file_label(label)}_{timings.started_at.strftime('%Y%m%d_%H%M')}.json",
+        mime="application/json"
+    )
@@ -0,0 +1,52 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from resource_policy import page_loads
+from rate_limit import portal_limiter
+
+FORM_ROWS_XPATH = "//table[contains(@class,'tableList_1')]//tr[contains(@id,'fformtr_')]"
+
+# JS condition: a tableList_1 whose header row names the tenderers list
+TENDERERS_TABLE_JS = """
+return Array.from(document.querySelectorAll('table.tableList_1')).some(function (table) {
+    var headers = Array.from(table.querySelectorAll('th')).map(function (th) {
+        return th.textContent.trim();
+    });
+    return headers.indexOf('S. No.') !== -1 && headers.indexOf('List of Tenderers') !== -1;
+});
+"""
+
+def wait_for_page_ready(driver, timeout=15):
+    """Wait until the current document reports readyState 'complete'"""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+    page_loads.sample(driver)
+
+def load_page(driver, url, timeout=15):
+    """driver.get paced by the portal rate limiter, then wait for the page"""
+    with portal_limiter.paced(driver):
+        driver.get(url)
+        wait_for_page_ready(driver, timeout)
+
+def wait_for_navigation(driver, old_element, timeout=15):
+    """Wait for a page transition: old element goes stale, then new document is ready"""
+    WebDriverWait(driver, timeout).until(EC.staleness_of(old_element))
+    wait_for_page_ready(driver, timeout)
+
+def click_and_wait_for_page(driver, element, timeout=15):
+    """Click an element that triggers a full page load and wait for the new page"""
+    old_page = driver.find_element(By.TAG_NAME, "html")
+    with portal_limiter.paced(driver):
+        element.click()
+        wait_for_navigation(driver, old_page, timeout)
+
+def wait_for_tenderers_table(driver, timeout=15):
+    """Wait until the Clarification tab's 'List of Tenderers' table is rendered"""
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script(TENDERERS_TABLE_JS))
+
+def wait_for_forms_table(driver, timeout=15):
+    """Wait until the tenderer's forms table rows are present"""
+    return WebDriverWait(driver, timeout).until(
+        EC.presence_of_all_elements_located((By.XPATH, FORM_ROWS_XPATH))
+    )